@@ -17,6 +17,10 @@ REM Install dependencies
 echo Installing dependencies...
 py -m pip install -r requirements.txt
 
+REM Compile CapCut parser (optional)
+echo Compiling CapCut parser...
+call compile_parser.bat
+
 REM Build executable
 echo Building executable...
 py -m PyInstaller build.spec --clean
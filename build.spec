@@ -17,9 +17,14 @@ yt_dlp_hiddenimports = collect_submodules('yt_dlp')
 # Collect customtkinter data
 ctk_datas = collect_data_files('customtkinter')
 
+# Prefer the mypyc-compiled CapCut parser when compile_parser.bat has built it
+pathex = ['src']
+if os.path.isdir('build_mypyc'):
+    pathex.insert(0, 'build_mypyc')
+
 a = Analysis(
     ['src/main.py'],
-    pathex=['src'],
+    pathex=pathex,
     binaries=[],
     datas=yt_dlp_datas + ctk_datas,
     hiddenimports=yt_dlp_hiddenimports + [
@@ -29,8 +34,13 @@ a = Analysis(
         # Local modules
         'ui',
         'ui.main_window',
+        'ui.capcut_window',
+        'ui.fonts',
+        'capcut_parser',
+        'caption_cache',
         'downloader',
         'history',
+        'json_utils',
         'settings',
         'validator',
     ],
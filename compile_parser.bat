@@ -0,0 +1,25 @@
+@echo off
+REM Compile the CapCut parser to a C extension with mypyc.
+REM Optional: needs mypy and a C compiler. If compilation fails the build
+REM falls back to the pure Python module in src.
+REM Set PYTHON to choose the interpreter (defaults to the py launcher).
+
+if not defined PYTHON set PYTHON=py
+
+if exist "build_mypyc" rmdir /s /q "build_mypyc"
+mkdir "build_mypyc"
+
+REM Compile from a staging folder so the module is named capcut_parser
+REM rather than src.capcut_parser
+copy src\capcut_parser.py build_mypyc\ >nul
+copy src\json_utils.py build_mypyc\ >nul
+
+pushd build_mypyc
+%PYTHON% -m mypyc capcut_parser.py
+if errorlevel 1 (
+    echo mypyc compilation failed, using pure Python parser
+    del /q *.pyd 2>nul
+)
+popd
+
+exit /b 0
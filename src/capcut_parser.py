@@ -3,13 +3,16 @@ CapCut Draft Parser Module
 Parses CapCut draft_content.json files to extract captions.
 """
 
-import json
 import os
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+import json_utils
 
-@dataclass
+
+@dataclass(slots=True)
 class CaptionItem:
     """Represents a single caption/subtitle item."""
     text: str
@@ -17,6 +20,33 @@ class CaptionItem:
     end_time: float    # in seconds
 
 
+@lru_cache(maxsize=4096)
+def _parse_text_content(content: str) -> str:
+    """
+    Extract text from a content string.
+    
+    Cached because drafts often reuse the same styled-text JSON across
+    many segments.
+    """
+    content = content.strip()
+    
+    # Plain text is the common case; skip the JSON parser entirely
+    if not content or content[0] != '{' or content[-1] != '}':
+        return content
+    
+    # Try to parse as JSON (CapCut stores styled text as JSON)
+    try:
+        data = json_utils.loads(content)
+        if isinstance(data, dict):
+            # Get the 'text' field which contains the actual caption
+            return data.get('text', '')
+    except json_utils.JSONDecodeError:
+        pass
+    
+    # If parsing failed, return as-is (plain text)
+    return content
+
+
 class CapCutParser:
     """Parser for CapCut draft_content.json files."""
     
@@ -24,16 +54,29 @@ class CapCutParser:
     def find_draft_file(folder_path: str) -> Optional[str]:
         """
         Find draft_content.json in a folder.
-        Searches recursively for the file.
+        Searches recursively for the file, stopping at the first match.
         """
         if os.path.isfile(folder_path):
             if folder_path.endswith('.json'):
                 return folder_path
             return None
         
-        for root, dirs, files in os.walk(folder_path):
-            if 'draft_content.json' in files:
-                return os.path.join(root, 'draft_content.json')
+        # Depth-first in the same order as os.walk, without building
+        # full file/dir lists for every folder
+        stack = [folder_path]
+        while stack:
+            current = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name == 'draft_content.json' and not entry.is_dir():
+                            return entry.path
+            except OSError:
+                continue
+            stack.extend(reversed(subdirs))
         return None
     
     @staticmethod
@@ -47,12 +90,28 @@ class CapCutParser:
         Returns:
             List of CaptionItem objects
         """
-        captions = []
+        captions: List[CaptionItem] = []
+        seen: Dict[str, int] = {}  # caption text -> index in captions
+        replaced: Set[int] = set()  # indices superseded by an earlier copy
+        found_any = False
+        
+        def add_caption(caption: CaptionItem) -> None:
+            """Add a caption, keeping only the earliest copy of each text."""
+            nonlocal found_any
+            found_any = True
+            if not caption.text.strip():
+                return
+            index = seen.get(caption.text)
+            if index is not None:
+                if caption.start_time >= captions[index].start_time:
+                    return
+                replaced.add(index)
+            seen[caption.text] = len(captions)
+            captions.append(caption)
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError, IOError) as e:
+            data = json_utils.load_file(file_path)
+        except (json_utils.JSONDecodeError, FileNotFoundError, IOError) as e:
             raise ValueError(f"Không thể đọc file: {e}")
         
         # CapCut stores tracks in different structures depending on version
@@ -65,13 +124,13 @@ class CapCutParser:
         texts = materials.get('texts', [])
         
         # Build a lookup map of text materials by ID
-        text_map = {}
-        for text_item in texts:
-            text_id = text_item.get('id', '')
-            content = text_item.get('content', '')
-            actual_text = CapCutParser._extract_text_from_content(content)
-            if text_id and actual_text:
-                text_map[text_id] = actual_text
+        text_map = {
+            text_item['id']: actual_text
+            for text_item in texts
+            if text_item.get('id')
+            and (actual_text := CapCutParser._extract_text_from_content(text_item.get('content', '')))
+        }
+        used_ids = set()
         
         # Parse from tracks to get timing and match with text materials
         for track in tracks:
@@ -92,22 +151,23 @@ class CapCutParser:
                 # Get text content via material_id
                 material_id = segment.get('material_id', '')
                 
-                if material_id and material_id in text_map:
-                    captions.append(CaptionItem(
+                # Each text material is only emitted once
+                if material_id in text_map and material_id not in used_ids:
+                    used_ids.add(material_id)
+                    add_caption(CaptionItem(
                         text=text_map[material_id],
                         start_time=start_sec,
                         end_time=end_sec
                     ))
-                    # Remove from map to avoid duplicates
-                    del text_map[material_id]
         
         # Add any remaining texts without timing (fallback)
         for text_id, text_content in text_map.items():
-            captions.append(CaptionItem(
-                text=text_content,
-                start_time=0,
-                end_time=0
-            ))
+            if text_id not in used_ids:
+                add_caption(CaptionItem(
+                    text=text_content,
+                    start_time=0,
+                    end_time=0
+                ))
         
         # Method 3: Check for stickers with text
         stickers = materials.get('stickers', [])
@@ -116,28 +176,24 @@ class CapCutParser:
             text = sticker.get('text', '')
             actual_text = CapCutParser._extract_text_from_content(text) if text else ''
             if actual_text:
-                captions.append(CaptionItem(
+                add_caption(CaptionItem(
                     text=actual_text,
                     start_time=0,
                     end_time=0
                 ))
         
         # Method 4: Deep search for any text content
-        if not captions:
-            captions = CapCutParser._deep_search_texts(data)
+        if not found_any:
+            for caption in CapCutParser._deep_search_texts(data):
+                add_caption(caption)
         
-        # Sort by start time
-        captions.sort(key=lambda x: x.start_time)
+        if replaced:
+            captions = [cap for i, cap in enumerate(captions) if i not in replaced]
         
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_captions = []
-        for cap in captions:
-            if cap.text not in seen and cap.text.strip():
-                seen.add(cap.text)
-                unique_captions.append(cap)
+        # Sort by start time
+        captions.sort(key=attrgetter('start_time'))
         
-        return unique_captions
+        return captions
     
     @staticmethod
     def _extract_text_from_content(content) -> str:
@@ -154,68 +210,63 @@ class CapCutParser:
         if not isinstance(content, str):
             return str(content)
         
-        # Try to parse as JSON (CapCut stores styled text as JSON)
-        content = content.strip()
-        if content.startswith('{') and content.endswith('}'):
-            try:
-                data = json.loads(content)
-                if isinstance(data, dict):
-                    # Get the 'text' field which contains the actual caption
-                    return data.get('text', '')
-            except json.JSONDecodeError:
-                pass
-        
-        # If not JSON or parsing failed, return as-is (plain text)
-        return content
+        return _parse_text_content(content)
     
     @staticmethod
-    def _deep_search_texts(data, depth=0, max_depth=10) -> List[CaptionItem]:
-        """Recursively search for text content in nested structures."""
-        captions = []
+    def _deep_search_texts(data: Any, max_depth: int = 10) -> Iterator[CaptionItem]:
+        """
+        Search for text content in nested structures.
+        Yields captions as they are found.
         
-        if depth > max_depth:
-            return captions
+        Uses an explicit stack instead of recursion so deeply nested drafts
+        don't pay a Python call frame per node. Children are pushed in
+        reverse so nodes are visited in the same order as a recursive walk.
+        """
+        stack: List[Tuple[Any, int]] = [(data, 0)]
         
-        if isinstance(data, dict):
-            # Check for text-like keys
-            for key in ['content', 'text', 'recognized_text', 'words']:
-                if key in data:
-                    value = data[key]
-                    if isinstance(value, str) and len(value.strip()) > 0:
-                        # Try to get timing
-                        start = data.get('start', 0)
-                        duration = data.get('duration', 0)
-                        if isinstance(start, (int, float)) and start > 1000:
-                            start = start / 1000000
-                        if isinstance(duration, (int, float)) and duration > 1000:
-                            duration = duration / 1000000
-                        
-                        captions.append(CaptionItem(
-                            text=value.strip(),
-                            start_time=start,
-                            end_time=start + duration
-                        ))
-                    elif isinstance(value, list):
-                        # Handle word-level data
-                        for item in value:
-                            if isinstance(item, dict):
-                                word = item.get('word', '') or item.get('text', '')
-                                if word:
-                                    captions.append(CaptionItem(
-                                        text=word,
-                                        start_time=0,
-                                        end_time=0
-                                    ))
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                continue
             
-            # Recurse into nested dicts
-            for v in data.values():
-                captions.extend(CapCutParser._deep_search_texts(v, depth + 1, max_depth))
-        
-        elif isinstance(data, list):
-            for item in data:
-                captions.extend(CapCutParser._deep_search_texts(item, depth + 1, max_depth))
-        
-        return captions
+            if isinstance(node, dict):
+                # Check for text-like keys
+                for key in ['content', 'text', 'recognized_text', 'words']:
+                    if key in node:
+                        value = node[key]
+                        if isinstance(value, str) and len(value.strip()) > 0:
+                            # Try to get timing
+                            start = node.get('start', 0)
+                            duration = node.get('duration', 0)
+                            if isinstance(start, (int, float)) and start > 1000:
+                                start = start / 1000000
+                            if isinstance(duration, (int, float)) and duration > 1000:
+                                duration = duration / 1000000
+                            
+                            yield CaptionItem(
+                                text=value.strip(),
+                                start_time=start,
+                                end_time=start + duration
+                            )
+                        elif isinstance(value, list):
+                            # Handle word-level data
+                            for item in value:
+                                if isinstance(item, dict):
+                                    word = item.get('word', '') or item.get('text', '')
+                                    if word:
+                                        yield CaptionItem(
+                                            text=word,
+                                            start_time=0,
+                                            end_time=0
+                                        )
+                
+                # Queue nested values
+                children: List[Any] = list(node.values())
+                children.reverse()
+                stack.extend((child, depth + 1) for child in children)
+            
+            elif isinstance(node, list):
+                stack.extend((child, depth + 1) for child in node[::-1])
     
     @staticmethod
     def to_srt(captions: List[CaptionItem]) -> str:
@@ -231,41 +282,62 @@ class CapCutParser:
         00:00:04,500 --> 00:00:08,000
         Another caption
         """
-        lines = []
-        
-        for i, cap in enumerate(captions, 1):
-            start = CapCutParser._format_srt_time(cap.start_time)
-            end = CapCutParser._format_srt_time(cap.end_time)
-            
-            lines.append(str(i))
-            lines.append(f"{start} --> {end}")
-            lines.append(cap.text)
-            lines.append("")  # Empty line between entries
+        return "".join(CapCutParser.iter_srt(captions))
+    
+    @staticmethod
+    def iter_srt(captions: List[CaptionItem]) -> Iterator[str]:
+        """Yield the SRT output of to_srt one entry at a time."""
+        starts = CapCutParser._format_srt_times(cap.start_time for cap in captions)
+        ends = CapCutParser._format_srt_times(cap.end_time for cap in captions)
         
+        # Entries after the first start with the blank separator line.
         # Use CRLF line endings for Windows/CapCut compatibility
-        return "\r\n".join(lines)
+        separator = ""
+        for i, (cap, start, end) in enumerate(zip(captions, starts, ends), 1):
+            yield f"{separator}{i}\r\n{start} --> {end}\r\n{cap.text}\r\n"
+            separator = "\r\n"
     
     @staticmethod
     def _format_srt_time(seconds: float) -> str:
         """Format seconds to SRT time format (HH:MM:SS,mmm)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
+        # Round rather than truncate: 1.001 * 1000 is 1000.9999999999999
+        hours, remainder = divmod(round(seconds * 1000), 3_600_000)
+        minutes, remainder = divmod(remainder, 60_000)
+        secs, millis = divmod(remainder, 1000)
         
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+        return "%02d:%02d:%02d,%03d" % (hours, minutes, secs, millis)
+    
+    @staticmethod
+    def _format_srt_times(times: Iterable[float]) -> List[str]:
+        """Format a batch of times in seconds to SRT time strings."""
+        format_time = CapCutParser._format_srt_time
+        return [format_time(t) for t in times]
     
     @staticmethod
     def to_txt(captions: List[CaptionItem]) -> str:
         """Convert captions to plain text (one line per caption)."""
-        return "\n".join(cap.text for cap in captions if cap.text.strip())
+        return "".join(CapCutParser.iter_txt(captions))
     
     @staticmethod
-    def to_txt_with_timing(captions: List[CaptionItem]) -> str:
-        """Convert captions to text with timing info."""
-        lines = []
+    def iter_txt(captions: List[CaptionItem]) -> Iterator[str]:
+        """Yield the output of to_txt one line at a time."""
+        separator = ""
         for cap in captions:
             if cap.text.strip():
-                start = CapCutParser._format_srt_time(cap.start_time)
-                lines.append(f"[{start}] {cap.text}")
-        return "\n".join(lines)
+                yield f"{separator}{cap.text}"
+                separator = "\n"
+    
+    @staticmethod
+    def to_txt_with_timing(captions: List[CaptionItem]) -> str:
+        """Convert captions to text with timing info."""
+        return "".join(CapCutParser.iter_txt_with_timing(captions))
+    
+    @staticmethod
+    def iter_txt_with_timing(captions: List[CaptionItem]) -> Iterator[str]:
+        """Yield the output of to_txt_with_timing one line at a time."""
+        visible = [cap for cap in captions if cap.text.strip()]
+        starts = CapCutParser._format_srt_times(cap.start_time for cap in visible)
+        separator = ""
+        for cap, start in zip(visible, starts):
+            yield f"{separator}[{start}] {cap.text}"
+            separator = "\n"
@@ -0,0 +1,102 @@
+"""
+Caption Cache Module
+Keeps parsed CapCut captions on disk so reopening a draft skips parsing.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import json_utils
+from capcut_parser import CaptionItem
+
+
+class CaptionCache:
+    """Stores parsed captions as JSON files keyed by version, draft path, size and mtime."""
+    
+    # Oldest entries beyond this count are removed after each write
+    MAX_ENTRIES = 50
+    
+    # Part of every key; bump when parse_draft output or the entry format
+    # changes so captions from older versions are not reused
+    CACHE_VERSION = 1
+    
+    def __init__(self, config_dir: Optional[str] = None):
+        """
+        Initialize caption cache.
+        
+        Args:
+            config_dir: Optional custom config directory path
+        """
+        if config_dir:
+            self.config_dir = Path(config_dir)
+        else:
+            appdata = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+            self.config_dir = Path(appdata) / 'YouTubeDownloader'
+        
+        self.cache_dir = self.config_dir / 'capcut_cache'
+        
+        # Ensure cache directory exists
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _entry_path(self, file_path: str) -> Optional[Path]:
+        """Get the cache file for a draft, or None if it can't be read."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = f"{self.CACHE_VERSION}:{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+    
+    def get(self, file_path: str) -> Optional[List[CaptionItem]]:
+        """
+        Get cached captions for a draft file.
+        
+        Returns:
+            List of CaptionItem objects, or None if not cached
+        """
+        entry = self._entry_path(file_path)
+        if entry is None or not entry.exists():
+            return None
+        
+        try:
+            data = json_utils.load_file(entry)
+            captions = [CaptionItem(text, start, end) for text, start, end in data]
+            # Mark as recently used for the size limit
+            os.utime(entry)
+            return captions
+        except (json_utils.JSONDecodeError, IOError, TypeError, ValueError) as e:
+            print(f"Warning: Could not read caption cache: {e}")
+            return None
+    
+    def put(self, file_path: str, captions: List[CaptionItem]) -> None:
+        """Cache parsed captions for a draft file."""
+        entry = self._entry_path(file_path)
+        if entry is None:
+            return
+        
+        try:
+            data = [[cap.text, cap.start_time, cap.end_time] for cap in captions]
+            json_utils.dump_to_file(data, entry)
+            self._prune()
+        except IOError as e:
+            print(f"Error saving caption cache: {e}")
+    
+    def _prune(self) -> None:
+        """Remove least recently used entries beyond MAX_ENTRIES."""
+        entries = sorted(self.cache_dir.glob('*.json'), key=lambda p: p.stat().st_mtime)
+        for entry in entries[:-self.MAX_ENTRIES]:
+            entry.unlink(missing_ok=True)
+
+
+# Global caption cache instance
+_cache_instance: Optional[CaptionCache] = None
+
+
+def get_caption_cache() -> CaptionCache:
+    """Get the global caption cache instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = CaptionCache()
+    return _cache_instance
@@ -8,13 +8,53 @@ import shutil
 import time
 import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Callable, Optional
 from pathlib import Path
 
-import yt_dlp
+# yt_dlp is imported where it is used: it takes a noticeable time to
+# import and is not needed until a video is fetched
 
 
-@dataclass
+# yt-dlp format selectors keyed by (has_ffmpeg, download_format, quality).
+# The "best" entry is used for qualities without their own entry.
+_FORMAT_TABLE = {
+    # Audio only
+    (True, "mp3", "best"): 'bestaudio/best',
+    (False, "mp3", "best"): 'bestaudio[ext=m4a]/bestaudio/best',
+    # Video only (no audio)
+    (True, "mp4_video", "best"): 'bestvideo[ext=mp4]/bestvideo/best',
+    (False, "mp4_video", "best"): 'bestvideo[ext=mp4]/bestvideo/best',
+    # Video + Audio, merged by FFmpeg
+    (True, "mp4", "1080p"): 'bestvideo[height<=1080][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=1080]+bestaudio/best[height<=1080]',
+    (True, "mp4", "720p"): 'bestvideo[height<=720][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=720]+bestaudio/best[height<=720]',
+    (True, "mp4", "480p"): 'bestvideo[height<=480][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=480]+bestaudio/best[height<=480]',
+    (True, "mp4", "best"): 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best[ext=mp4]/best',
+    # Video + Audio, pre-merged streams only
+    (False, "mp4", "1080p"): 'best[height<=1080][ext=mp4]/best[height<=1080]/best',
+    (False, "mp4", "720p"): 'best[height<=720][ext=mp4]/best[height<=720]/best',
+    (False, "mp4", "480p"): 'best[height<=480][ext=mp4]/best[height<=480]/best',
+    (False, "mp4", "best"): 'best[ext=mp4]/best',
+}
+
+
+def preload_yt_dlp() -> None:
+    """Import yt_dlp on a background thread so the first fetch starts sooner."""
+    threading.Thread(target=lambda: __import__('yt_dlp'), daemon=True).start()
+
+
+@lru_cache(maxsize=1)
+def get_ffmpeg_path() -> Optional[str]:
+    """
+    Get the path to the FFmpeg executable, or None if not installed.
+    
+    The PATH lookup is cached; call get_ffmpeg_path.cache_clear() after
+    changing PATH.
+    """
+    return shutil.which("ffmpeg")
+
+
+@dataclass(slots=True)
 class VideoInfo:
     """Contains information about a YouTube video."""
     title: str
@@ -35,7 +75,7 @@ class VideoInfo:
         return f"{minutes}:{seconds:02d}"
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadProgress:
     """Contains download progress information."""
     status: str = 'downloading'
@@ -68,10 +108,17 @@ class DownloadProgress:
 class YouTubeDownloader:
     """Downloads YouTube videos using yt-dlp."""
     
+    # Minimum seconds between progress callbacks
+    PROGRESS_INTERVAL = 0.1
+    
+    # Downloads running at once; later ones wait for a free slot
+    MAX_CONCURRENT_DOWNLOADS = 3
+    
     def __init__(self, output_path: str = "."):
         self.output_path = output_path
         self._cancel_flag = False
         self._current_download: Optional[threading.Thread] = None
+        self._download_slots = threading.BoundedSemaphore(self.MAX_CONCURRENT_DOWNLOADS)
     
     def get_video_info(self, url: str) -> Optional[VideoInfo]:
         """Get information about a YouTube video without downloading."""
@@ -82,6 +129,8 @@ class YouTubeDownloader:
         }
         
         try:
+            import yt_dlp
+            
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
                 
@@ -105,9 +154,10 @@ class YouTubeDownloader:
         url: str,
         output_path: Optional[str] = None,
         progress_callback: Optional[Callable[[DownloadProgress], None]] = None,
-        complete_callback: Optional[Callable[[bool, str], None]] = None,
+        complete_callback: Optional[Callable[[bool, str, str], None]] = None,
         quality: str = "best",
-        download_format: str = "mp4"
+        download_format: str = "mp4",
+        start_callback: Optional[Callable[[], None]] = None
     ) -> None:
         """
         Download a YouTube video.
@@ -116,22 +166,41 @@ class YouTubeDownloader:
             url: YouTube video URL
             output_path: Output directory
             progress_callback: Called with progress updates
-            complete_callback: Called when download completes
+            complete_callback: Called when download completes with
+                (success, message, file_path); file_path is the final file
+                reported by yt-dlp, or "" if unknown
             quality: Video quality (best, 1080p, 720p, 480p)
             download_format: Format (mp4, mp3, mp4_video)
+            start_callback: Called when the download gets a free slot and
+                starts; at most MAX_CONCURRENT_DOWNLOADS run at once
         """
         self._cancel_flag = False
         output_dir = output_path or self.output_path
         
         Path(output_dir).mkdir(parents=True, exist_ok=True)
+        last_progress_time = [0.0]
+        # Path of the downloaded file, updated as postprocessors move it
+        final_path = ['']
         
         def progress_hook(d):
             if self._cancel_flag:
                 raise Exception("Download cancelled")
             
+            if d['status'] == 'finished':
+                final_path[0] = d.get('filename') or final_path[0]
+            
             if d['status'] == 'downloading' and progress_callback:
                 total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
                 downloaded = d.get('downloaded_bytes', 0)
+                
+                # yt-dlp calls this many times per second; only forward
+                # updates at PROGRESS_INTERVAL, plus the final one
+                now = time.monotonic()
+                is_final = bool(total) and downloaded >= total
+                if now - last_progress_time[0] < self.PROGRESS_INTERVAL and not is_final:
+                    return
+                last_progress_time[0] = now
+                
                 speed = d.get('speed', 0)
                 eta = d.get('eta', 0)
                 
@@ -146,99 +215,89 @@ class YouTubeDownloader:
                 )
                 progress_callback(progress)
         
-        has_ffmpeg = shutil.which("ffmpeg") is not None
+        def postprocessor_hook(d):
+            # Merging, audio extraction and moving rename the file
+            if d['status'] == 'finished':
+                final_path[0] = d.get('info_dict', {}).get('filepath') or final_path[0]
+        
+        has_ffmpeg = get_ffmpeg_path() is not None
         timestamp = int(time.time() * 1000)
         
-        # Configure based on download format
-        if download_format == "mp3":
-            # Audio only - extract to MP3
-            if has_ffmpeg:
-                ydl_opts = {
-                    'format': 'bestaudio/best',
-                    'outtmpl': os.path.join(output_dir, f'%(title)s_{timestamp}.%(ext)s'),
-                    'progress_hooks': [progress_hook],
-                    'quiet': True,
-                    'no_warnings': True,
-                    'postprocessors': [{
-                        'key': 'FFmpegExtractAudio',
-                        'preferredcodec': 'mp3',
-                        'preferredquality': '192',
-                    }],
-                }
-            else:
-                ydl_opts = {
-                    'format': 'bestaudio[ext=m4a]/bestaudio/best',
-                    'outtmpl': os.path.join(output_dir, f'%(title)s_{timestamp}.%(ext)s'),
-                    'progress_hooks': [progress_hook],
-                    'quiet': True,
-                    'no_warnings': True,
-                }
-                
-        elif download_format == "mp4_video":
-            # Video only (no audio)
-            ydl_opts = {
-                'format': 'bestvideo[ext=mp4]/bestvideo/best',
-                'outtmpl': os.path.join(output_dir, f'%(title)s_{timestamp}.%(ext)s'),
-                'progress_hooks': [progress_hook],
-                'quiet': True,
-                'no_warnings': True,
-            }
-            
-        else:
-            # mp4 - Video + Audio (default)
-            if has_ffmpeg:
-                if quality == "1080p":
-                    format_str = 'bestvideo[height<=1080][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=1080]+bestaudio/best[height<=1080]'
-                elif quality == "720p":
-                    format_str = 'bestvideo[height<=720][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=720]+bestaudio/best[height<=720]'
-                elif quality == "480p":
-                    format_str = 'bestvideo[height<=480][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<=480]+bestaudio/best[height<=480]'
-                else:
-                    format_str = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best[ext=mp4]/best'
-                
-                ydl_opts = {
-                    'format': format_str,
-                    'outtmpl': os.path.join(output_dir, f'%(title)s_{timestamp}.%(ext)s'),
-                    'progress_hooks': [progress_hook],
-                    'quiet': True,
-                    'no_warnings': True,
-                    'merge_output_format': 'mp4',
-                }
-            else:
-                if quality == "1080p":
-                    format_str = 'best[height<=1080][ext=mp4]/best[height<=1080]/best'
-                elif quality == "720p":
-                    format_str = 'best[height<=720][ext=mp4]/best[height<=720]/best'
-                elif quality == "480p":
-                    format_str = 'best[height<=480][ext=mp4]/best[height<=480]/best'
-                else:
-                    format_str = 'best[ext=mp4]/best'
-                
-                ydl_opts = {
-                    'format': format_str,
-                    'outtmpl': os.path.join(output_dir, f'%(title)s_{timestamp}.%(ext)s'),
-                    'progress_hooks': [progress_hook],
-                    'quiet': True,
-                    'no_warnings': True,
-                }
+        # Configure based on download format (unknown formats use mp4)
+        if download_format not in ("mp3", "mp4_video"):
+            download_format = "mp4"
+        format_str = _FORMAT_TABLE.get(
+            (has_ffmpeg, download_format, quality),
+            _FORMAT_TABLE[(has_ffmpeg, download_format, "best")]
+        )
+        
+        ydl_opts = {
+            'format': format_str,
+            'outtmpl': os.path.join(output_dir, f'%(title)s_{timestamp}.%(ext)s'),
+            'progress_hooks': [progress_hook],
+            'postprocessor_hooks': [postprocessor_hook],
+            'quiet': True,
+            'no_warnings': True,
+        }
+        if has_ffmpeg and download_format == "mp3":
+            # Extract audio to MP3
+            ydl_opts['postprocessors'] = [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'mp3',
+                'preferredquality': '192',
+            }]
+        elif has_ffmpeg and download_format == "mp4":
+            # Merge separate video and audio streams
+            ydl_opts['merge_output_format'] = 'mp4'
         
         def do_download():
-            try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([url])
-                
-                if complete_callback:
-                    complete_callback(True, "Tải thành công!")
-            except Exception as e:
-                error_msg = str(e)
-                if "cancelled" in error_msg.lower():
-                    error_msg = "Đã hủy tải xuống"
-                if complete_callback:
-                    complete_callback(False, f"Lỗi: {error_msg}")
+            with self._download_slots:
+                if start_callback:
+                    start_callback()
+                try:
+                    import yt_dlp
+                    
+                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                        info = ydl.extract_info(url, download=True)
+                        if not final_path[0] and info:
+                            final_path[0] = self._find_output_file(ydl.prepare_filename(info))
+                except Exception as e:
+                    error_msg = str(e)
+                    if "cancelled" in error_msg.lower():
+                        error_msg = "Đã hủy tải xuống"
+                    if complete_callback:
+                        complete_callback(False, f"Lỗi: {error_msg}", "")
+                    return
+            
+            if complete_callback:
+                complete_callback(True, "Tải thành công!", final_path[0])
         
         self._current_download = threading.Thread(target=do_download, daemon=True)
         self._current_download.start()
     
+    @staticmethod
+    def _find_output_file(planned_path: str) -> str:
+        """
+        Find a finished download from the path yt-dlp planned for it.
+        
+        Used when the hooks did not report the final path. Postprocessors
+        may change the extension, so any finished file with the planned
+        title-based name matches.
+        """
+        if os.path.isfile(planned_path):
+            return planned_path
+        output_dir, planned_name = os.path.split(planned_path)
+        stem = os.path.splitext(planned_name)[0]
+        try:
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    name, ext = os.path.splitext(entry.name)
+                    if name == stem and ext != '.part' and entry.is_file():
+                        return entry.path
+        except OSError:
+            pass
+        return ''
+    
     def cancel(self) -> None:
         """Cancel the current download."""
         self._cancel_flag = True
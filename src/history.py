@@ -3,15 +3,23 @@ Download History Manager Module
 Saves and loads download history for persistence across app restarts.
 """
 
-import json
+import atexit
 import os
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 
+import json_utils
 
-@dataclass
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass(slots=True)
 class HistoryItem:
     """Represents a download history entry."""
     url: str
@@ -31,6 +39,9 @@ class HistoryItem:
 class DownloadHistory:
     """Manages download history with JSON file persistence."""
     
+    # Mutations within this many seconds are written in a single save
+    SAVE_DELAY = 1.0
+    
     def __init__(self, config_dir: Optional[str] = None):
         """
         Initialize history manager.
@@ -45,35 +56,65 @@ class DownloadHistory:
             self.config_dir = Path(appdata) / 'YouTubeDownloader'
         
         self.history_file = self.config_dir / 'history.json'
-        self._history: List[HistoryItem] = []
+        self._history: 'OrderedDict[str, HistoryItem]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
         
         # Ensure config directory exists
         self.config_dir.mkdir(parents=True, exist_ok=True)
         
         # Load existing history
         self._load()
+        
+        # Write any pending changes on exit
+        atexit.register(self.flush)
     
     def _load(self) -> None:
         """Load history from file."""
         if self.history_file.exists():
             try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self._history = [HistoryItem.from_dict(item) for item in data]
-            except (json.JSONDecodeError, IOError, KeyError) as e:
+                data = json_utils.load_file(self.history_file)
+                self._history = OrderedDict(
+                    (entry.url, entry) for entry in map(HistoryItem.from_dict, data)
+                )
+            except (json_utils.JSONDecodeError, IOError, KeyError) as e:
                 print(f"Warning: Could not load history: {e}")
-                self._history = []
+                self._history = OrderedDict()
     
     def save(self) -> bool:
         """Save history to file."""
-        try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                data = [item.to_dict() for item in self._history]
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            return True
-        except IOError as e:
-            print(f"Error saving history: {e}")
-            return False
+        with self._lock:
+            try:
+                data = [item.to_dict() for item in self._history.values()]
+                json_utils.dump_to_file(data, self.history_file)
+                # Only a successful write clears pending changes, so a
+                # failed one is retried by the next save or the exit flush
+                self._dirty = False
+                return True
+            except IOError as e:
+                print(f"Error saving history: {e}")
+                return False
+    
+    def flush(self) -> bool:
+        """Save immediately if there are unsaved changes."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+            return self.save()
+    
+    def _mark_dirty(self) -> None:
+        """Schedule a save, coalescing changes made within SAVE_DELAY."""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
     
     def add(self, url: str, title: str, file_path: str, status: str = "completed") -> None:
         """
@@ -85,47 +126,62 @@ class DownloadHistory:
             file_path: Path to downloaded file
             status: Download status (completed/error)
         """
-        # Check if URL already exists and update it
-        for i, item in enumerate(self._history):
-            if item.url == url:
-                self._history[i] = HistoryItem(
-                    url=url,
-                    title=title,
-                    file_path=file_path,
-                    download_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    status=status
-                )
-                self.save()
-                return
-        
-        # Add new item at the beginning
-        self._history.insert(0, HistoryItem(
+        item = HistoryItem(
             url=url,
             title=title,
             file_path=file_path,
-            download_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            download_date=time.strftime(DATE_FORMAT),
             status=status
-        ))
-        
-        # Limit history to 100 items
-        if len(self._history) > 100:
-            self._history = self._history[:100]
+        )
         
-        self.save()
+        with self._lock:
+            # Check if URL already exists and update it in place
+            if url in self._history:
+                self._history[url] = item
+                self._mark_dirty()
+                return
+            
+            # Add new item at the beginning
+            self._history[url] = item
+            self._history.move_to_end(url, last=False)
+            
+            # Limit history to 100 items
+            while len(self._history) > 100:
+                self._history.popitem(last=True)
+            
+            self._mark_dirty()
     
     def get_all(self) -> List[HistoryItem]:
         """Get all history items."""
-        return self._history.copy()
+        with self._lock:
+            return list(self._history.values())
+    
+    def get_page(self, offset: int, count: int) -> List[HistoryItem]:
+        """
+        Get a slice of history items, newest first.
+        
+        Args:
+            offset: Number of items to skip
+            count: Maximum number of items to return
+        """
+        with self._lock:
+            return list(islice(self._history.values(), offset, offset + count))
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._history)
     
     def clear(self) -> None:
         """Clear all history."""
-        self._history = []
-        self.save()
+        with self._lock:
+            self._history.clear()
+            self._mark_dirty()
     
     def remove(self, url: str) -> None:
         """Remove an item from history by URL."""
-        self._history = [item for item in self._history if item.url != url]
-        self.save()
+        with self._lock:
+            if self._history.pop(url, None) is not None:
+                self._mark_dirty()
 
 
 # Global history instance
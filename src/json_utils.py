@@ -0,0 +1,72 @@
+"""
+JSON Helper Module
+Uses orjson when available and falls back to the standard library.
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this regardless of which backend is active.
+JSONDecodeError = json.JSONDecodeError
+
+# Files larger than this are memory-mapped by load_file
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from a str or bytes object."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: Union[str, os.PathLike]) -> Any:
+    """
+    Parse a JSON file.
+    
+    With orjson, files larger than MMAP_THRESHOLD are memory-mapped and
+    parsed in place instead of first being read into a bytes copy.
+    """
+    with open(path, 'rb') as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+        return loads(f.read())
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def dump_to_file(obj: Any, path: Union[str, os.PathLike]) -> None:
+    """
+    Write an object as JSON to a file atomically.
+    
+    The data goes to a temporary file next to the target which then
+    replaces it, so a crash mid-write never leaves a truncated file.
+    """
+    tmp_path = f"{os.fspath(path)}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(obj))
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a partial temporary file next to the target
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -3,11 +3,12 @@ Settings Management Module
 Handles saving and loading application settings.
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import json_utils
+
 
 class Settings:
     """Manages application settings with JSON file persistence."""
@@ -54,10 +55,9 @@ class Settings:
         
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    saved_settings = json.load(f)
-                    self._settings.update(saved_settings)
-            except (json.JSONDecodeError, IOError) as e:
+                saved_settings = json_utils.load_file(self.config_file)
+                self._settings.update(saved_settings)
+            except (json_utils.JSONDecodeError, IOError) as e:
                 print(f"Warning: Could not load settings: {e}")
         
         # Set default download folder if not set
@@ -72,8 +72,7 @@ class Settings:
             True if save was successful, False otherwise
         """
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, indent=2, ensure_ascii=False)
+            json_utils.dump_to_file(self._settings, self.config_file)
             return True
         except IOError as e:
             print(f"Error saving settings: {e}")
@@ -4,22 +4,55 @@ UI for extracting captions from CapCut projects.
 """
 
 import os
+import threading
+from collections import OrderedDict
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from typing import Callable, Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 
 from capcut_parser import CapCutParser, CaptionItem
+from caption_cache import get_caption_cache
+from ui.fonts import get_font
+
+
+# Export format -> (file extension, chunk generator, save dialog file types)
+_EXPORT_FORMATS = {
+    "srt": (".srt", CapCutParser.iter_srt, [("SRT files", "*.srt")]),
+    "txt": (".txt", CapCutParser.iter_txt, [("Text files", "*.txt")]),
+    "txt_timing": (".txt", CapCutParser.iter_txt_with_timing, [("Text files", "*.txt")]),
+}
 
 
 class CapCutWindow(ctk.CTkToplevel):
     """Window for CapCut Caption Extractor tool."""
     
+    # Number of parsed drafts kept in memory for quick reloads
+    PARSE_CACHE_SIZE = 8
+    
+    # Longest preview inserted into the textbox; exports are not truncated
+    PREVIEW_MAX_CHARS = 65536
+    # Write buffer for exports, so large files go out in a few syscalls
+    EXPORT_BUFFER_SIZE = 1 << 20
+    
     def __init__(self, master=None, on_back: Callable = None):
         super().__init__(master)
         
         self.on_back = on_back
         self.captions: List[CaptionItem] = []
         self.current_file: Optional[str] = None
+        # Suggested export file name for the current draft
+        self._default_export_name = "captions"
+        self._parse_cache: "OrderedDict[Tuple[str, float], List[CaptionItem]]" = OrderedDict()
+        # Background parses run one at a time; they share the caches above
+        self._parse_lock = threading.Lock()
+        # Incremented per load so only the latest selection is applied
+        self._load_seq = 0
+        # Formatted output of self.captions by format type
+        self._format_cache: Dict[str, str] = {}
+        # What the preview textbox shows: "initial", "captions" or "empty"
+        self._preview_state = ""
+        # Text currently shown in the preview textbox
+        self._current_preview_text = ""
         
         # Configure window
         self.title("📝 CapCut Caption Extractor")
@@ -38,7 +71,10 @@ class CapCutWindow(ctk.CTkToplevel):
     def _on_close(self):
         """Handle window close."""
         if self.on_back:
+            # The launcher keeps this window for reuse, so only hide it
+            self.withdraw()
             self.on_back()
+            return
         self.destroy()
     
     def _center_window(self):
@@ -52,20 +88,25 @@ class CapCutWindow(ctk.CTkToplevel):
     
     def _create_widgets(self):
         """Create all UI widgets."""
+        # Create everything first, then pack it in one pass so Tk can
+        # compute the layout once instead of after every widget
+        self._build_widgets()
+        self._layout_widgets()
+    
+    def _build_widgets(self):
+        """Instantiate all widgets without placing them."""
         # Main container
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.main_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
         # === Header ===
         self.header_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        self.header_frame.pack(fill="x", pady=(0, 15))
         
         # Back button
         if self.on_back:
             self.back_btn = ctk.CTkButton(
                 self.header_frame,
                 text="← Quay lại",
-                font=ctk.CTkFont(size=11),
+                font=get_font(11),
                 width=90,
                 height=28,
                 corner_radius=6,
@@ -73,44 +114,38 @@ class CapCutWindow(ctk.CTkToplevel):
                 fg_color="#7f8c8d",
                 hover_color="#636e72"
             )
-            self.back_btn.pack(side="left", padx=(0, 10))
         
         self.title_label = ctk.CTkLabel(
             self.header_frame,
             text="📝 CapCut Caption Extractor",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=get_font(24, "bold")
         )
-        self.title_label.pack(side="left")
         
         # === File Selection ===
         self.file_frame = ctk.CTkFrame(self.main_frame)
-        self.file_frame.pack(fill="x", pady=(0, 15))
         
         self.file_title = ctk.CTkLabel(
             self.file_frame,
             text="📂 Chọn file draft_content.json hoặc folder project CapCut:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(12, "bold"),
             anchor="w"
         )
-        self.file_title.pack(fill="x", padx=12, pady=(10, 5))
         
         self.file_inner_frame = ctk.CTkFrame(self.file_frame, fg_color="transparent")
-        self.file_inner_frame.pack(fill="x", padx=12, pady=(0, 10))
         
         self.file_path_label = ctk.CTkLabel(
             self.file_inner_frame,
             text="Chưa chọn file...",
-            font=ctk.CTkFont(size=10),
+            font=get_font(10),
             text_color="gray",
             anchor="w",
             wraplength=400
         )
-        self.file_path_label.pack(side="left", fill="x", expand=True)
         
         self.browse_folder_btn = ctk.CTkButton(
             self.file_inner_frame,
             text="📁 Folder",
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             width=70,
             height=28,
             corner_radius=6,
@@ -118,12 +153,11 @@ class CapCutWindow(ctk.CTkToplevel):
             fg_color="#9b59b6",
             hover_color="#8e44ad"
         )
-        self.browse_folder_btn.pack(side="right", padx=(5, 0))
         
         self.browse_file_btn = ctk.CTkButton(
             self.file_inner_frame,
             text="📄 File",
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             width=60,
             height=28,
             corner_radius=6,
@@ -131,54 +165,48 @@ class CapCutWindow(ctk.CTkToplevel):
             fg_color="#3498db",
             hover_color="#2980b9"
         )
-        self.browse_file_btn.pack(side="right")
         
         # === Preview ===
         self.preview_label = ctk.CTkLabel(
             self.main_frame,
             text="📋 Preview Caption:",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(13, "bold"),
             anchor="w"
         )
-        self.preview_label.pack(fill="x", pady=(5, 5))
         
         self.preview_text = ctk.CTkTextbox(
             self.main_frame,
-            font=ctk.CTkFont(size=12),
+            font=get_font(12),
             corner_radius=10,
             wrap="word"
         )
-        self.preview_text.pack(fill="both", expand=True, pady=(0, 15))
-        self.preview_text.insert("1.0", "💡 Chọn file draft_content.json từ project CapCut để xem caption.\n\n"
-                                        "Vị trí thường gặp:\n"
-                                        "C:\\Users\\<user>\\AppData\\Local\\CapCut\\User Data\\Projects\\com.lveditor.draft\\<project_id>\\")
-        self.preview_text.configure(state="disabled")
+        self._set_preview("💡 Chọn file draft_content.json từ project CapCut để xem caption.\n\n"
+                          "Vị trí thường gặp:\n"
+                          "C:\\Users\\<user>\\AppData\\Local\\CapCut\\User Data\\Projects\\com.lveditor.draft\\<project_id>\\",
+                          "initial")
         
         # === Export Options ===
         self.export_frame = ctk.CTkFrame(self.main_frame)
-        self.export_frame.pack(fill="x", pady=(0, 10))
         
         self.format_label = ctk.CTkLabel(
             self.export_frame,
             text="📥 Định dạng xuất:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(12, "bold"),
             anchor="w"
         )
-        self.format_label.pack(side="left", padx=12, pady=10)
         
         self.format_var = ctk.StringVar(value="srt")
         self.format_selector = ctk.CTkSegmentedButton(
             self.export_frame,
-            values=["srt", "txt", "txt_timing"],
+            values=list(_EXPORT_FORMATS),
             variable=self.format_var,
-            font=ctk.CTkFont(size=11)
+            font=get_font(11)
         )
-        self.format_selector.pack(side="left", padx=10, pady=10)
         
         self.export_btn = ctk.CTkButton(
             self.export_frame,
             text="💾 Xuất File",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(12, "bold"),
             width=100,
             height=32,
             corner_radius=6,
@@ -187,27 +215,57 @@ class CapCutWindow(ctk.CTkToplevel):
             hover_color="#1e8449",
             state="disabled"
         )
-        self.export_btn.pack(side="right", padx=12, pady=10)
         
         # === Status Bar ===
         self.status_frame = ctk.CTkFrame(self.main_frame, height=30)
-        self.status_frame.pack(fill="x")
         
         self.status_label = ctk.CTkLabel(
             self.status_frame,
             text="Sẵn sàng",
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             text_color="gray"
         )
-        self.status_label.pack(side="left", padx=10, pady=5)
         
         self.count_label = ctk.CTkLabel(
             self.status_frame,
             text="",
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             text_color="gray"
         )
+    
+    def _layout_widgets(self):
+        """Pack the widgets created by _build_widgets."""
+        # === Header ===
+        self.header_frame.pack(fill="x", pady=(0, 15))
+        if self.on_back:
+            self.back_btn.pack(side="left", padx=(0, 10))
+        self.title_label.pack(side="left")
+        
+        # === File Selection ===
+        self.file_frame.pack(fill="x", pady=(0, 15))
+        self.file_title.pack(fill="x", padx=12, pady=(10, 5))
+        self.file_inner_frame.pack(fill="x", padx=12, pady=(0, 10))
+        self.file_path_label.pack(side="left", fill="x", expand=True)
+        self.browse_folder_btn.pack(side="right", padx=(5, 0))
+        self.browse_file_btn.pack(side="right")
+        
+        # === Preview ===
+        self.preview_label.pack(fill="x", pady=(5, 5))
+        self.preview_text.pack(fill="both", expand=True, pady=(0, 15))
+        
+        # === Export Options ===
+        self.export_frame.pack(fill="x", pady=(0, 10))
+        self.format_label.pack(side="left", padx=12, pady=10)
+        self.format_selector.pack(side="left", padx=10, pady=10)
+        self.export_btn.pack(side="right", padx=12, pady=10)
+        
+        # === Status Bar ===
+        self.status_frame.pack(fill="x")
+        self.status_label.pack(side="left", padx=10, pady=5)
         self.count_label.pack(side="right", padx=10, pady=5)
+        
+        # Main container goes in last, once its contents are arranged
+        self.main_frame.pack(fill="both", expand=True, padx=20, pady=20)
     
     def _on_browse_file(self):
         """Browse for draft_content.json file."""
@@ -237,45 +295,122 @@ class CapCutWindow(ctk.CTkToplevel):
                 )
     
     def _load_file(self, file_path: str):
-        """Load and parse a draft file."""
+        """Load and parse a draft file in the background."""
         self.current_file = file_path
         self.file_path_label.configure(text=file_path, text_color="#3498db")
         self.status_label.configure(text="🔄 Đang phân tích...")
-        self.update()
+        self.export_btn.configure(state="disabled")
         
-        try:
-            self.captions = CapCutParser.parse_draft(file_path)
-            
-            if self.captions:
-                # Show preview
-                preview_text = CapCutParser.to_txt(self.captions)
-                self.preview_text.configure(state="normal")
-                self.preview_text.delete("1.0", "end")
-                self.preview_text.insert("1.0", preview_text)
-                self.preview_text.configure(state="disabled")
-                
-                # Update status
-                self.status_label.configure(text="✅ Đã tải thành công")
-                self.count_label.configure(text=f"📝 {len(self.captions)} caption")
-                self.export_btn.configure(state="normal")
+        self._load_seq += 1
+        seq = self._load_seq
+        
+        def parse():
+            try:
+                with self._parse_lock:
+                    captions = self._parse_draft_cached(file_path)
+            except Exception as e:
+                self.after(0, self._on_parse_error, e, seq)
             else:
-                self.preview_text.configure(state="normal")
-                self.preview_text.delete("1.0", "end")
-                self.preview_text.insert("1.0", "⚠️ Không tìm thấy caption trong file này.\n\n"
-                                                "Hãy đảm bảo project có caption/text đã được tạo.")
-                self.preview_text.configure(state="disabled")
-                self.status_label.configure(text="⚠️ Không có caption")
-                self.count_label.configure(text="")
-                self.export_btn.configure(state="disabled")
-                
-        except ValueError as e:
-            messagebox.showerror("Lỗi", str(e))
+                self.after(0, self._apply_captions, captions, file_path, seq)
+        
+        threading.Thread(target=parse, daemon=True).start()
+    
+    def _apply_captions(self, captions: List[CaptionItem], file_path: str, seq: int):
+        """Show parsed captions (runs on the UI thread)."""
+        if seq != self._load_seq:
+            # A newer file was selected while this one was parsing
+            return
+        self.captions = captions
+        # The project name is the folder above the draft's folder
+        self._default_export_name = (
+            os.path.basename(os.path.dirname(os.path.dirname(file_path))) or "captions")
+        self._format_cache.clear()
+        
+        if self.captions:
+            # Show preview, cut at a line break if it is very long
+            preview_text = self._get_formatted("txt")
+            if len(preview_text) > self.PREVIEW_MAX_CHARS:
+                cut = preview_text.rfind("\n", 0, self.PREVIEW_MAX_CHARS)
+                if cut <= 0:
+                    cut = self.PREVIEW_MAX_CHARS
+                preview_text = (preview_text[:cut] +
+                                "\n\n… (Preview đã được rút gọn, file xuất vẫn có đầy đủ caption)")
+            self._set_preview(preview_text, "captions")
+            status = ("✅ Đã tải thành công", f"📝 {len(self.captions)} caption", "normal")
+        else:
+            # The template is already shown after loading another empty draft
+            if self._preview_state != "empty":
+                self._set_preview("⚠️ Không tìm thấy caption trong file này.\n\n"
+                                  "Hãy đảm bảo project có caption/text đã được tạo.",
+                                  "empty")
+            status = ("⚠️ Không có caption", "", "disabled")
+        
+        # Apply the status bar changes together in one idle pass
+        self.after_idle(self._update_status_bar, *status)
+    
+    def _set_preview(self, text: str, state: str):
+        """Replace the preview textbox content if it has changed."""
+        self._preview_state = state
+        if text == self._current_preview_text:
+            return
+        self._current_preview_text = text
+        self.preview_text.configure(state="normal")
+        self.preview_text.delete("1.0", "end")
+        self.preview_text.insert("1.0", text)
+        self.preview_text.configure(state="disabled")
+    
+    def _update_status_bar(self, status: str, count: str, export_state: str):
+        """Update status text, caption count and export button together."""
+        self.status_label.configure(text=status)
+        self.count_label.configure(text=count)
+        self.export_btn.configure(state=export_state)
+    
+    def _on_parse_error(self, error: Exception, seq: int):
+        """Report a parse failure (runs on the UI thread)."""
+        if seq != self._load_seq:
+            return
+        if isinstance(error, ValueError):
+            messagebox.showerror("Lỗi", str(error))
             self.status_label.configure(text="❌ Lỗi đọc file")
-            self.export_btn.configure(state="disabled")
-        except Exception as e:
-            messagebox.showerror("Lỗi", f"Đã xảy ra lỗi: {e}")
+        else:
+            messagebox.showerror("Lỗi", f"Đã xảy ra lỗi: {error}")
             self.status_label.configure(text="❌ Lỗi")
-            self.export_btn.configure(state="disabled")
+        self.export_btn.configure(state="disabled")
+    
+    def _parse_draft_cached(self, file_path: str) -> List[CaptionItem]:
+        """
+        Parse a draft, reusing the result if the file is unchanged.
+        Checks the in-memory cache, then the on-disk caption cache.
+        """
+        try:
+            key = (file_path, os.path.getmtime(file_path))
+        except OSError:
+            # Let the parser report the missing file
+            return CapCutParser.parse_draft(file_path)
+        
+        if key in self._parse_cache:
+            self._parse_cache.move_to_end(key)
+            return self._parse_cache[key]
+        
+        disk_cache = get_caption_cache()
+        captions = disk_cache.get(file_path)
+        if captions is None:
+            captions = CapCutParser.parse_draft(file_path)
+            disk_cache.put(file_path, captions)
+        
+        self._parse_cache[key] = captions
+        if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+        return captions
+    
+    def _get_formatted(self, format_type: str) -> str:
+        """Get the captions converted to a format, building it once per load."""
+        content = self._format_cache.get(format_type)
+        if content is None:
+            _, iter_chunks, _ = _EXPORT_FORMATS[format_type]
+            content = "".join(iter_chunks(self.captions))
+            self._format_cache[format_type] = content
+        return content
     
     def _on_export(self):
         """Export captions to file."""
@@ -286,33 +421,13 @@ class CapCutWindow(ctk.CTkToplevel):
         format_type = self.format_var.get()
         
         # Determine file extension and content
-        if format_type == "srt":
-            extension = ".srt"
-            content = CapCutParser.to_srt(self.captions)
-            file_types = [("SRT files", "*.srt")]
-        elif format_type == "txt":
-            extension = ".txt"
-            content = CapCutParser.to_txt(self.captions)
-            file_types = [("Text files", "*.txt")]
-        else:  # txt_timing
-            extension = ".txt"
-            content = CapCutParser.to_txt_with_timing(self.captions)
-            file_types = [("Text files", "*.txt")]
-        
-        # Get default filename from source
-        default_name = "captions"
-        if self.current_file:
-            folder = os.path.dirname(self.current_file)
-            # Try to find project name from folder structure
-            parent_folder = os.path.basename(os.path.dirname(folder))
-            if parent_folder:
-                default_name = parent_folder
+        extension, iter_chunks, file_types = _EXPORT_FORMATS[format_type]
         
         # Ask for save location
         save_path = filedialog.asksaveasfilename(
             title="Lưu file caption",
             defaultextension=extension,
-            initialfile=default_name + extension,
+            initialfile=self._default_export_name + extension,
             filetypes=file_types
         )
         
@@ -320,8 +435,12 @@ class CapCutWindow(ctk.CTkToplevel):
             try:
                 # Use UTF-8 with BOM for SRT files (CapCut compatibility)
                 encoding = 'utf-8-sig' if format_type == "srt" else 'utf-8'
-                with open(save_path, 'w', encoding=encoding, newline='') as f:
-                    f.write(content)
+                # Reuse already built output, otherwise stream it chunk by chunk
+                content = self._format_cache.get(format_type)
+                chunks = [content] if content is not None else iter_chunks(self.captions)
+                with open(save_path, 'w', encoding=encoding, newline='',
+                          buffering=self.EXPORT_BUFFER_SIZE) as f:
+                    f.writelines(chunks)
                 
                 self.status_label.configure(text=f"✅ Đã lưu: {os.path.basename(save_path)}")
                 messagebox.showinfo("Thành công", f"Đã xuất caption thành công!\n\n{save_path}")
@@ -0,0 +1,23 @@
+"""
+Shared Fonts Module
+Caches CTkFont objects so windows and widgets reuse them.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import customtkinter as ctk
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int, weight: Optional[str] = None) -> ctk.CTkFont:
+    """
+    Get a shared font, creating it on first use.
+    
+    Fonts are created lazily because CTkFont needs the Tk root to exist.
+    
+    Args:
+        size: Font size
+        weight: Font weight ("bold"), or None for the theme default
+    """
+    return ctk.CTkFont(size=size, weight=weight)
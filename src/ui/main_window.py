@@ -4,26 +4,66 @@ The main application window with paste button and animated download queue.
 """
 
 import os
-import shutil
 import subprocess
 import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import pyperclip
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import time
 
 from validator import YouTubeValidator
-from downloader import YouTubeDownloader, VideoInfo, DownloadProgress
+from downloader import YouTubeDownloader, VideoInfo, DownloadProgress, get_ffmpeg_path, preload_yt_dlp
 from settings import get_settings
 from history import get_history, DownloadHistory
+from ui.fonts import get_font
+
+
+# Seconds a fetched VideoInfo is reused for the same video ID
+VIDEO_INFO_TTL = 600
+# Most video infos kept at once
+VIDEO_INFO_CACHE_SIZE = 50
+
+# Recently fetched video info, oldest first: video ID -> (fetch time, info).
+# Written from the info pool and read on the UI thread.
+_VIDEO_INFO_CACHE: "OrderedDict[str, Tuple[float, VideoInfo]]" = OrderedDict()
+_VIDEO_INFO_LOCK = threading.Lock()
+
+
+def _get_cached_video_info(video_id: str) -> Optional[VideoInfo]:
+    """Get recently fetched info for a video, or None if missing or expired."""
+    with _VIDEO_INFO_LOCK:
+        cached = _VIDEO_INFO_CACHE.get(video_id)
+        if cached is None:
+            return None
+        if time.time() - cached[0] >= VIDEO_INFO_TTL:
+            del _VIDEO_INFO_CACHE[video_id]
+            return None
+        return cached[1]
+
+
+def _cache_video_info(video_id: str, info: VideoInfo) -> None:
+    """Remember fetched info, dropping expired and excess entries."""
+    now = time.time()
+    with _VIDEO_INFO_LOCK:
+        _VIDEO_INFO_CACHE[video_id] = (now, info)
+        _VIDEO_INFO_CACHE.move_to_end(video_id)
+        # Entries are kept in fetch order, so expired ones are at the front
+        while _VIDEO_INFO_CACHE:
+            fetched_at = next(iter(_VIDEO_INFO_CACHE.values()))[0]
+            if len(_VIDEO_INFO_CACHE) <= VIDEO_INFO_CACHE_SIZE and now - fetched_at < VIDEO_INFO_TTL:
+                break
+            _VIDEO_INFO_CACHE.popitem(last=False)
 
 
 class DownloadStatus(Enum):
     """Status of a download item."""
     LOADING = "loading"      # Getting video info (yellow glow)
+    QUEUED = "queued"        # Waiting for a free download slot (gray)
     DOWNLOADING = "downloading"  # Downloading (blue glow)
     COMPLETED = "completed"  # Done (green glow)
     ERROR = "error"          # Error (red)
@@ -45,19 +85,26 @@ class AnimatedDownloadCard(ctk.CTkFrame):
     
     COLORS = {
         DownloadStatus.LOADING: ("#f1c40f", "#f39c12"),      # Yellow
+        DownloadStatus.QUEUED: ("#95a5a6", "#7f8c8d"),       # Gray
         DownloadStatus.DOWNLOADING: ("#3498db", "#2980b9"),  # Blue
         DownloadStatus.COMPLETED: ("#2ecc71", "#27ae60"),    # Green
         DownloadStatus.ERROR: ("#e74c3c", "#c0392b"),        # Red
     }
     
-    def __init__(self, master, item: DownloadItem, on_open_click=None, on_open_folder_click=None, **kwargs):
+    def __init__(self, master, item: DownloadItem, on_open_click=None, on_open_folder_click=None,
+                 on_animation_change=None, **kwargs):
         super().__init__(master, **kwargs)
         
         self.item = item
         self.on_open_click = on_open_click
         self.on_open_folder_click = on_open_folder_click
+        # Called with (card, active) so the window's glow ticker animates it
+        self.on_animation_change = on_animation_change
         self._glow_phase = 0
         self._animating = False
+        self._flash_count = 0
+        # Percentage currently shown in the status label, -1 if none
+        self._last_pct_shown = -1
         
         self.configure(corner_radius=10, border_width=3)
         self._update_border_color()
@@ -73,7 +120,7 @@ class AnimatedDownloadCard(ctk.CTkFrame):
         self.title_label = ctk.CTkLabel(
             self.info_frame,
             text=item.title or "Đang tải thông tin...",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(13, "bold"),
             anchor="w",
             wraplength=300
         )
@@ -82,7 +129,7 @@ class AnimatedDownloadCard(ctk.CTkFrame):
         self.url_label = ctk.CTkLabel(
             self.info_frame,
             text=self._truncate_url(item.url),
-            font=ctk.CTkFont(size=10),
+            font=get_font(10),
             text_color="gray",
             anchor="w"
         )
@@ -92,21 +139,23 @@ class AnimatedDownloadCard(ctk.CTkFrame):
         self.action_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
         self.action_frame.pack(side="right", padx=(10, 0))
         
+        completed = item.status == DownloadStatus.COMPLETED
         self.status_label = ctk.CTkLabel(
             self.action_frame,
-            text="⏳ Đang tải...",
-            font=ctk.CTkFont(size=11),
+            text="✅ Hoàn thành" if completed else "⏳ Đang tải...",
+            font=get_font(11),
             width=120
         )
         self.status_label.pack()
         
         # Buttons frame (hidden initially)
         self.buttons_frame = ctk.CTkFrame(self.action_frame, fg_color="transparent")
+        self._buttons_visible = False
         
         self.open_btn = ctk.CTkButton(
             self.buttons_frame,
             text="▶️ Mở",
-            font=ctk.CTkFont(size=10),
+            font=get_font(10),
             width=55,
             height=26,
             corner_radius=5,
@@ -119,7 +168,7 @@ class AnimatedDownloadCard(ctk.CTkFrame):
         self.folder_btn = ctk.CTkButton(
             self.buttons_frame,
             text="📁",
-            font=ctk.CTkFont(size=12),
+            font=get_font(12),
             width=35,
             height=26,
             corner_radius=5,
@@ -129,6 +178,10 @@ class AnimatedDownloadCard(ctk.CTkFrame):
         )
         self.folder_btn.pack(side="left")
         
+        # Cards restored from history start out finished
+        if completed:
+            self._set_buttons_visible(True)
+        
         self._start_animation()
     
     def _truncate_url(self, url: str, max_length: int = 50) -> str:
@@ -145,18 +198,22 @@ class AnimatedDownloadCard(ctk.CTkFrame):
     def _start_animation(self):
         """Start border glow animation."""
         if self.item.status in [DownloadStatus.LOADING, DownloadStatus.DOWNLOADING]:
-            self._animating = True
-            self._animate_glow()
+            self._set_animating(True)
     
     def _stop_animation(self):
         """Stop border animation."""
-        self._animating = False
+        self._set_animating(False)
     
-    def _animate_glow(self):
-        """Animate border glow effect."""
-        if not self._animating:
+    def _set_animating(self, active: bool):
+        """Register or unregister this card with the glow ticker."""
+        if self._animating == active:
             return
-        
+        self._animating = active
+        if self.on_animation_change:
+            self.on_animation_change(self, active)
+    
+    def advance_glow(self):
+        """Step the border glow effect (called by the window's ticker)."""
         colors = self.COLORS.get(self.item.status, ("#666", "#444"))
         # Pulse between two shades
         self._glow_phase = (self._glow_phase + 1) % 20
@@ -164,15 +221,13 @@ class AnimatedDownloadCard(ctk.CTkFrame):
             self.configure(border_color=colors[0])
         else:
             self.configure(border_color=colors[1])
-        
-        self.after(100, self._animate_glow)
     
     def update_status(self, status: DownloadStatus, title: str = None, progress: float = None, file_path: str = None, error: str = None):
         """Update the card status and appearance."""
         old_status = self.item.status
         self.item.status = status
         
-        if title:
+        if title and title != self.item.title:
             self.item.title = title
             self.title_label.configure(text=title)
         
@@ -185,43 +240,70 @@ class AnimatedDownloadCard(ctk.CTkFrame):
         if error:
             self.item.error_message = error
         
+        if status == DownloadStatus.DOWNLOADING:
+            # Most progress ticks don't change the whole percent shown
+            pct = round(self.item.progress)
+            if pct != self._last_pct_shown:
+                self._last_pct_shown = pct
+                self.status_label.configure(text=f"⬇️ {pct}%")
+        
+        # Everything below only depends on the status, so repeated updates
+        # with the same status (progress ticks) stop here
+        if old_status == status:
+            return
+        
+        if status != DownloadStatus.DOWNLOADING:
+            self._last_pct_shown = -1
+        
         # Update UI based on status
         if status == DownloadStatus.LOADING:
             self.status_label.configure(text="⏳ Đang tải...")
-            self.buttons_frame.pack_forget()
+            self._set_buttons_visible(False)
+        elif status == DownloadStatus.QUEUED:
+            self.status_label.configure(text="⏸ Đang chờ")
+            self._set_buttons_visible(False)
+            self._stop_animation()
         elif status == DownloadStatus.DOWNLOADING:
-            progress_text = f"⬇️ {self.item.progress:.0f}%"
-            self.status_label.configure(text=progress_text)
-            self.buttons_frame.pack_forget()
+            self._set_buttons_visible(False)
         elif status == DownloadStatus.COMPLETED:
             self.status_label.configure(text="✅ Hoàn thành")
-            self.buttons_frame.pack(pady=(5, 0))
+            self._set_buttons_visible(True)
             self._stop_animation()
             # Flash green effect
             self._flash_complete()
         elif status == DownloadStatus.ERROR:
             self.status_label.configure(text=f"❌ Lỗi")
-            self.buttons_frame.pack_forget()
+            self._set_buttons_visible(False)
             self._stop_animation()
         
         self._update_border_color()
         
-        # Start/stop animation based on status change
-        if old_status != status:
-            if status in [DownloadStatus.LOADING, DownloadStatus.DOWNLOADING]:
-                self._animating = True
-                self._animate_glow()
+        # Start animation for the active states
+        if status in [DownloadStatus.LOADING, DownloadStatus.DOWNLOADING]:
+            self._set_animating(True)
+    
+    def _set_buttons_visible(self, visible: bool):
+        """Show or hide the action buttons, only repacking on a change."""
+        if visible == self._buttons_visible:
+            return
+        self._buttons_visible = visible
+        if visible:
+            self.buttons_frame.pack(pady=(5, 0))
+        else:
+            self.buttons_frame.pack_forget()
     
     def _flash_complete(self):
         """Flash green when download completes."""
-        def flash(count):
-            if count <= 0:
-                return
-            current = self.cget("border_color")
-            new_color = "#2ecc71" if current != "#2ecc71" else "#27ae60"
-            self.configure(border_color=new_color)
-            self.after(150, lambda: flash(count - 1))
-        flash(6)
+        self._flash_count = 6
+        self._flash_tick()
+    
+    def _flash_tick(self):
+        """Alternate the border between two greens until the flash ends."""
+        if self._flash_count <= 0:
+            return
+        self.configure(border_color="#2ecc71" if self._flash_count % 2 == 0 else "#27ae60")
+        self._flash_count -= 1
+        self.after(150, self._flash_tick)
     
     def _on_open(self):
         """Handle open button click."""
@@ -237,6 +319,15 @@ class AnimatedDownloadCard(ctk.CTkFrame):
 class YouTubeDownloaderWindow(ctk.CTkToplevel):
     """YouTube Downloader tool window."""
     
+    # Video info lookups that may run at the same time
+    INFO_WORKERS = 8
+    
+    # Milliseconds between border glow steps of active cards
+    GLOW_INTERVAL = 100
+    
+    # History cards created at startup and per "load more" click
+    HISTORY_PAGE_SIZE = 20
+    
     def __init__(self, master=None, on_back=None):
         super().__init__(master)
         
@@ -255,10 +346,28 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         
         # Handle window close
         self.protocol("WM_DELETE_WINDOW", self._on_close)
+        # Stop background work however the window is destroyed; with the
+        # launcher that is only when its root window closes
+        self.bind("<Destroy>", self._on_destroy, add="+")
         
         # Initialize downloader
         self.downloader = YouTubeDownloader(self.settings.download_folder)
+        preload_yt_dlp()
+        # Shared pool for video info lookups instead of a thread per paste
+        self._info_executor = ThreadPoolExecutor(
+            max_workers=self.INFO_WORKERS,
+            thread_name_prefix="video-info"
+        )
+        # Opening files and folders, which can stall in the shell
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fileio")
         self.download_cards: Dict[str, AnimatedDownloadCard] = {}
+        # Card shown at the top of the queue, where new downloads are inserted
+        self._first_card: Optional[AnimatedDownloadCard] = None
+        # Cards with a glowing border, all stepped by one shared timer
+        self._animating_cards: Set[AnimatedDownloadCard] = set()
+        self._glow_job: Optional[str] = None
+        # Number of history items already shown
+        self._history_offset = 0
         
         # Build UI
         self._create_widgets()
@@ -275,9 +384,26 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
     def _on_close(self):
         """Handle window close."""
         if self.on_back:
+            # The launcher keeps this window for reuse, so only hide it;
+            # running downloads carry on in the background
+            self.withdraw()
             self.on_back()
+            return
         self.destroy()
     
+    def _on_destroy(self, event):
+        """Release the worker pools once the window itself is destroyed."""
+        # Destroy events of child widgets also reach the window's binding
+        if event.widget is not self:
+            return
+        # Pool workers aren't daemon threads, so queued lookups would
+        # otherwise keep the process alive after the last window closes
+        self._info_executor.shutdown(wait=False, cancel_futures=True)
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        if self._glow_job is not None:
+            self.after_cancel(self._glow_job)
+            self._glow_job = None
+    
     def _center_window(self):
         """Center the window on screen."""
         self.update_idletasks()
@@ -287,6 +413,25 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         y = (self.winfo_screenheight() // 2) - (height // 2)
         self.geometry(f'{width}x{height}+{x}+{y}')
     
+    def _set_card_animating(self, card: AnimatedDownloadCard, active: bool):
+        """Add or remove a card from the glow ticker."""
+        if active:
+            self._animating_cards.add(card)
+            if self._glow_job is None:
+                self._glow_job = self.after(self.GLOW_INTERVAL, self._tick_glow)
+        else:
+            self._animating_cards.discard(card)
+    
+    def _tick_glow(self):
+        """Step the glow of every animating card, then reschedule."""
+        if not self._animating_cards:
+            # Nothing to animate; the next active card restarts the timer
+            self._glow_job = None
+            return
+        for card in self._animating_cards:
+            card.advance_glow()
+        self._glow_job = self.after(self.GLOW_INTERVAL, self._tick_glow)
+    
     def _create_widgets(self):
         """Create all UI widgets."""
         # Main container with padding
@@ -302,7 +447,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
             self.back_btn = ctk.CTkButton(
                 self.header_frame,
                 text="← Quay lại",
-                font=ctk.CTkFont(size=11),
+                font=get_font(11),
                 width=90,
                 height=28,
                 corner_radius=6,
@@ -315,7 +460,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.title_label = ctk.CTkLabel(
             self.header_frame,
             text="🎬 YouTube Downloader",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=get_font(24, "bold")
         )
         self.title_label.pack(side="left")
         
@@ -323,7 +468,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.ffmpeg_btn = ctk.CTkButton(
             self.header_frame,
             text="⚙️ Kiểm tra...",
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             width=110,
             height=28,
             corner_radius=6,
@@ -340,7 +485,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.folder_title = ctk.CTkLabel(
             self.folder_frame,
             text="📁 Thư mục lưu video:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(12, "bold"),
             anchor="w"
         )
         self.folder_title.pack(fill="x", padx=12, pady=(10, 5))
@@ -351,7 +496,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.folder_path_label = ctk.CTkLabel(
             self.folder_inner_frame,
             text=self.settings.download_folder,
-            font=ctk.CTkFont(size=10),
+            font=get_font(10),
             text_color="#3498db",
             anchor="w",
             wraplength=380
@@ -361,7 +506,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.change_folder_btn = ctk.CTkButton(
             self.folder_inner_frame,
             text="📂 Đổi",
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             width=70,
             height=28,
             corner_radius=6,
@@ -378,7 +523,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.format_label = ctk.CTkLabel(
             self.format_frame,
             text="🎬 Định dạng tải:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=get_font(12, "bold"),
             anchor="w"
         )
         self.format_label.pack(side="left", padx=12, pady=10)
@@ -388,7 +533,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
             self.format_frame,
             values=["mp4", "mp3", "mp4_video"],
             variable=self.format_var,
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             command=self._on_format_change
         )
         self.format_selector.pack(side="right", padx=12, pady=10)
@@ -397,7 +542,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.format_desc = ctk.CTkLabel(
             self.format_frame,
             text="Video + Audio",
-            font=ctk.CTkFont(size=10),
+            font=get_font(10),
             text_color="gray"
         )
         self.format_desc.pack(side="right", padx=(0, 10), pady=10)
@@ -406,7 +551,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.paste_btn = ctk.CTkButton(
             self.main_frame,
             text="📋  PASTE LINK VÀ TẢI",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=get_font(16, "bold"),
             height=45,
             corner_radius=10,
             command=self._on_paste_click,
@@ -419,7 +564,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.queue_label = ctk.CTkLabel(
             self.main_frame,
             text="📥 Danh sách tải xuống:",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=get_font(13, "bold"),
             anchor="w"
         )
         self.queue_label.pack(fill="x", pady=(5, 10))
@@ -436,11 +581,23 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.empty_label = ctk.CTkLabel(
             self.queue_frame,
             text="💡 Copy link YouTube và nhấn 'PASTE LINK VÀ TẢI' để bắt đầu",
-            font=ctk.CTkFont(size=12),
+            font=get_font(12),
             text_color="gray"
         )
         self.empty_label.pack(pady=30)
         
+        # Shown below the history cards while older entries are not loaded
+        self.more_history_btn = ctk.CTkButton(
+            self.queue_frame,
+            text="⬇️ Xem thêm lịch sử",
+            font=get_font(11),
+            height=28,
+            corner_radius=6,
+            command=self._load_history_page,
+            fg_color="#7f8c8d",
+            hover_color="#636e72"
+        )
+        
         # === Status Bar ===
         self.status_frame = ctk.CTkFrame(self.main_frame, height=30)
         self.status_frame.pack(fill="x", pady=(10, 0))
@@ -448,14 +605,15 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.status_label = ctk.CTkLabel(
             self.status_frame,
             text="Sẵn sàng",
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             text_color="gray"
         )
         self.status_label.pack(side="left", padx=10, pady=5)
     
     def _is_ffmpeg_installed(self) -> bool:
         """Check if FFmpeg is installed and available in PATH."""
-        return shutil.which("ffmpeg") is not None
+        # Uses the downloader's cached PATH lookup
+        return get_ffmpeg_path() is not None
     
     def _check_ffmpeg_status(self):
         """Check FFmpeg installation status and update UI."""
@@ -484,14 +642,21 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         self.format_desc.configure(text=descriptions.get(value, ""))
     
     def _load_history(self):
-        """Load download history and display as completed cards."""
-        history_items = self.history.get_all()
-        
-        if not history_items:
+        """Load the first page of download history as completed cards."""
+        if len(self.history) == 0:
             return
         
         # Hide empty state
         self.empty_label.pack_forget()
+        self._load_history_page()
+    
+    def _load_history_page(self):
+        """Add the next page of history cards below the ones shown."""
+        history_items = self.history.get_page(self._history_offset, self.HISTORY_PAGE_SIZE)
+        self._history_offset += len(history_items)
+        
+        # New cards are packed just above the "load more" button
+        self.more_history_btn.pack(pady=(0, 10))
         
         # Create cards for each history item
         for hist_item in history_items:
@@ -511,18 +676,18 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
                 self.queue_frame,
                 item,
                 on_open_click=self._open_file,
-                on_open_folder_click=self._open_folder
-            )
-            card.pack(fill="x", pady=(0, 10))
-            
-            # Mark as completed immediately (no animation)
-            card.update_status(
-                DownloadStatus.COMPLETED,
-                title=hist_item.title,
-                file_path=hist_item.file_path
+                on_open_folder_click=self._open_folder,
+                on_animation_change=self._set_card_animating
             )
+            # The card is built completed, so no status update or flash is needed
+            card.pack(fill="x", pady=(0, 10), before=self.more_history_btn)
+            if self._first_card is None:
+                self._first_card = card
             
             self.download_cards[hist_item.url] = card
+        
+        if self._history_offset >= len(self.history):
+            self.more_history_btn.pack_forget()
     
     def _on_paste_click(self):
         """Handle paste button click - paste URL and start download immediately."""
@@ -536,21 +701,30 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
             messagebox.showwarning("Cảnh báo", "Clipboard trống! Hãy copy một URL YouTube trước.")
             return
         
-        url = clipboard_content.strip()
-        
-        # Validate URL
-        is_valid, video_id, message = YouTubeValidator.validate_and_extract(url)
+        # Each line or space separated token may be a separate link
+        valid_urls: Dict[str, str] = {}  # url -> video ID
+        message = "URL không được để trống"
+        for url in clipboard_content.split():
+            is_valid, video_id, message = YouTubeValidator.validate_and_extract(url)
+            if is_valid:
+                valid_urls.setdefault(url, video_id)
         
-        if not is_valid:
+        if not valid_urls:
             messagebox.showwarning("URL không hợp lệ", f"{message}\n\nHãy copy một link YouTube hợp lệ.")
             return
         
-        # Generate unique key for this download (allows same URL multiple times)
-        download_key = f"{url}_{int(time.time() * 1000)}"
-        
         # Hide empty state
         self.empty_label.pack_forget()
         
+        # Add in reverse so the first link ends up at the top
+        for url, video_id in reversed(valid_urls.items()):
+            self._queue_url(url, video_id)
+    
+    def _queue_url(self, url: str, video_id: str):
+        """Add a download card for a URL and fetch its info in the background."""
+        # Generate unique key for this download (allows same URL multiple times)
+        download_key = f"{url}_{int(time.time() * 1000)}"
+        
         # Create download item
         item = DownloadItem(url=url)
         
@@ -559,17 +733,24 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
             self.queue_frame,
             item,
             on_open_click=self._open_file,
-            on_open_folder_click=self._open_folder
+            on_open_folder_click=self._open_folder,
+            on_animation_change=self._set_card_animating
         )
-        # Pack at beginning to show new downloads at top
-        for widget in self.queue_frame.winfo_children():
-            widget.pack_forget()
-        card.pack(fill="x", pady=(0, 10))
-        # Re-pack existing cards below
-        for key, existing_card in self.download_cards.items():
-            existing_card.pack(fill="x", pady=(0, 10))
+        # Insert above the current top card to show new downloads at top
+        if self._first_card is not None:
+            card.pack(fill="x", pady=(0, 10), before=self._first_card)
+        else:
+            card.pack(fill="x", pady=(0, 10))
+        self._first_card = card
         
         self.download_cards[download_key] = card
+        
+        # Reuse info fetched recently for the same video
+        cached_info = _get_cached_video_info(video_id)
+        if cached_info is not None:
+            self._start_download(card, url, cached_info)
+            return
+        
         self.status_label.configure(text="🔍 Đang lấy thông tin video...")
         
         # Get video info in background
@@ -577,36 +758,35 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
             try:
                 info = self.downloader.get_video_info(url)
                 if info:
-                    self.after(0, lambda: self._start_download(card, url, info))
+                    _cache_video_info(video_id, info)
+                    self.after(0, self._start_download, card, url, info)
                 else:
-                    self.after(0, lambda: self._handle_error_card(card, "Không thể lấy thông tin video"))
+                    self.after(0, self._handle_error_card, card, "Không thể lấy thông tin video")
             except Exception as e:
-                self.after(0, lambda: self._handle_error_card(card, str(e)))
+                self.after(0, self._handle_error_card, card, str(e))
         
-        threading.Thread(target=fetch_and_download, daemon=True).start()
+        self._info_executor.submit(fetch_and_download)
     
     def _start_download(self, card: AnimatedDownloadCard, url: str, info: VideoInfo):
         """Start downloading a video after getting info."""
-        card.update_status(DownloadStatus.DOWNLOADING, title=info.title, progress=0)
+        # Shown as waiting until the downloader has a free slot for it
+        card.update_status(DownloadStatus.QUEUED, title=info.title, progress=0)
         self.status_label.configure(text=f"⬇️ Đang tải: {info.title[:30]}...")
         
+        def on_start():
+            self.after(0, lambda: card.update_status(
+                DownloadStatus.DOWNLOADING,
+                progress=0
+            ))
+        
         def on_progress(progress: DownloadProgress):
             self.after(0, lambda: card.update_status(
                 DownloadStatus.DOWNLOADING,
                 progress=progress.percent
             ))
         
-        def on_complete(success: bool, message: str):
+        def on_complete(success: bool, message: str, file_path: str):
             if success:
-                # Find the downloaded file
-                file_path = os.path.join(self.settings.download_folder, f"{info.title}.mp4")
-                # Try common extensions
-                for ext in ['.mp4', '.webm', '.mkv']:
-                    potential_path = os.path.join(self.settings.download_folder, f"{info.title}{ext}")
-                    if os.path.exists(potential_path):
-                        file_path = potential_path
-                        break
-                
                 # Save to history
                 self.history.add(
                     url=url,
@@ -629,7 +809,8 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
             progress_callback=on_progress,
             complete_callback=on_complete,
             quality=self.settings.video_quality,
-            download_format=self.format_var.get()  # mp4, mp3, or mp4_video
+            download_format=self.format_var.get(),  # mp4, mp3, or mp4_video
+            start_callback=on_start
         )
     
     def _handle_error_card(self, card: AnimatedDownloadCard, error_message: str):
@@ -639,14 +820,24 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
     
     def _open_file(self, file_path: str):
         """Open downloaded file."""
+        # os.startfile can block while Windows launches the app, so it
+        # runs on the file I/O pool instead of the UI thread
+        self._io_pool.submit(self._do_open_file, file_path)
+    
+    def _open_folder(self, file_path: str):
+        """Open folder containing the file."""
+        self._io_pool.submit(self._do_open_folder, file_path)
+    
+    def _do_open_file(self, file_path: str):
+        """Open a file with its default app (runs on the I/O pool)."""
         if os.path.exists(file_path):
             os.startfile(file_path)
         else:
             # Open folder instead if file not found
-            self._open_folder(file_path)
+            self._do_open_folder(file_path)
     
-    def _open_folder(self, file_path: str):
-        """Open folder containing the file."""
+    def _do_open_folder(self, file_path: str):
+        """Open the folder containing a file (runs on the I/O pool)."""
         folder = os.path.dirname(file_path)
         if os.path.exists(folder):
             os.startfile(folder)
@@ -676,17 +867,40 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         ):
             self.ffmpeg_btn.configure(state="disabled", text="⏳ Đang cài...")
             self.status_label.configure(text="🔧 Đang cài đặt FFmpeg...")
-            self.update()
+            self.update_idletasks()
             
             def install():
                 try:
-                    # Install via winget
-                    result = subprocess.run(
+                    # Install via winget, showing its output as it arrives
+                    proc = subprocess.Popen(
                         ["winget", "install", "-e", "--id", "Gyan.FFmpeg", "--accept-source-agreements", "--accept-package-agreements"],
-                        capture_output=True,
-                        text=True,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,
+                        # winget writes UTF-8; a bad byte must not abort the install
+                        encoding="utf-8",
+                        errors="replace",
                         creationflags=subprocess.CREATE_NO_WINDOW
                     )
+                    # Only the last lines are kept for the error message
+                    last_lines = deque(maxlen=5)
+                    already_installed = False
+                    try:
+                        for line in proc.stdout:
+                            line = line.strip()
+                            if not line:
+                                continue
+                            last_lines.append(line)
+                            if "already installed" in line.lower():
+                                already_installed = True
+                            self.after(0, lambda text=f"🔧 {line[:60]}": self.status_label.configure(text=text))
+                        returncode = proc.wait()
+                    finally:
+                        # Don't leave winget running or its pipe open if
+                        # reading the output failed
+                        if proc.poll() is None:
+                            proc.kill()
+                            proc.wait()
+                        proc.stdout.close()
                     
                     # Find FFmpeg location and add to PATH
                     ffmpeg_bin_path = self._find_ffmpeg_path()
@@ -694,10 +908,10 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
                     if ffmpeg_bin_path:
                         self._add_to_path(ffmpeg_bin_path)
                         self.after(0, lambda: self._ffmpeg_install_complete(True, "FFmpeg đã được cài đặt!"))
-                    elif result.returncode == 0 or "already installed" in result.stdout.lower():
+                    elif returncode == 0 or already_installed:
                         self.after(0, lambda: self._ffmpeg_install_complete(True, "FFmpeg đã cài. Vui lòng khởi động lại app."))
                     else:
-                        self.after(0, lambda: self._ffmpeg_install_complete(False, f"Lỗi: {result.stderr or result.stdout}"))
+                        self.after(0, self._ffmpeg_install_complete, False, "Lỗi: " + "\n".join(last_lines))
                         
                 except FileNotFoundError:
                     self.after(0, lambda: self._ffmpeg_install_complete(
@@ -705,7 +919,7 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
                         "winget không khả dụng. Tải FFmpeg từ ffmpeg.org"
                     ))
                 except Exception as e:
-                    self.after(0, lambda: self._ffmpeg_install_complete(False, str(e)))
+                    self.after(0, self._ffmpeg_install_complete, False, str(e))
             
             threading.Thread(target=install, daemon=True).start()
     
@@ -719,13 +933,20 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         
         # Check WinGet packages
         winget_packages = os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\WinGet\Packages")
-        if os.path.exists(winget_packages):
-            for folder in os.listdir(winget_packages):
-                if "FFmpeg" in folder:
-                    folder_path = os.path.join(winget_packages, folder)
-                    for root, dirs, files in os.walk(folder_path):
-                        if "ffmpeg.exe" in files:
-                            return root
+        # WinGet extracts to <package>\<build folder>\bin\ffmpeg.exe, so only
+        # the build folders need listing instead of walking the whole tree
+        try:
+            with os.scandir(winget_packages) as packages:
+                for package in packages:
+                    if "FFmpeg" not in package.name or not package.is_dir():
+                        continue
+                    with os.scandir(package.path) as builds:
+                        for build in builds:
+                            bin_path = os.path.join(build.path, "bin")
+                            if build.is_dir() and os.path.isfile(os.path.join(bin_path, "ffmpeg.exe")):
+                                return bin_path
+        except OSError:
+            pass
         
         for path in search_paths:
             if os.path.exists(path) and os.path.exists(os.path.join(path, "ffmpeg.exe")):
@@ -737,24 +958,45 @@ class YouTubeDownloaderWindow(ctk.CTkToplevel):
         """Add FFmpeg to PATH."""
         current_path = os.environ.get("PATH", "")
         if ffmpeg_path.lower() not in current_path.lower():
+            # Update the user PATH in the registry directly; setx starts a
+            # process and truncates values longer than 1024 characters
             try:
                 import winreg
-                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Environment", 0, winreg.KEY_READ)
-                user_path, _ = winreg.QueryValueEx(key, "Path")
-                winreg.CloseKey(key)
-            except:
-                user_path = ""
-            
-            if ffmpeg_path.lower() not in user_path.lower():
-                new_path = f"{user_path};{ffmpeg_path}" if user_path else ffmpeg_path
-                subprocess.run(["setx", "PATH", new_path], capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
+                with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Environment", 0,
+                                    winreg.KEY_READ | winreg.KEY_WRITE) as key:
+                    try:
+                        user_path, value_type = winreg.QueryValueEx(key, "Path")
+                    except FileNotFoundError:
+                        user_path, value_type = "", winreg.REG_EXPAND_SZ
+                    
+                    if ffmpeg_path.lower() not in user_path.lower():
+                        new_path = f"{user_path};{ffmpeg_path}" if user_path else ffmpeg_path
+                        winreg.SetValueEx(key, "Path", 0, value_type, new_path)
+                        self._broadcast_environment_change()
+            except (ImportError, OSError) as e:
+                print(f"Warning: Could not update user PATH: {e}")
             
             os.environ["PATH"] = f"{current_path};{ffmpeg_path}"
+            get_ffmpeg_path.cache_clear()
+    
+    def _broadcast_environment_change(self):
+        """Tell running programs that environment variables changed."""
+        import ctypes
+        HWND_BROADCAST = 0xFFFF
+        WM_SETTINGCHANGE = 0x001A
+        SMTO_ABORTIFHUNG = 0x0002
+        result = ctypes.c_ulong()
+        ctypes.windll.user32.SendMessageTimeoutW(
+            HWND_BROADCAST, WM_SETTINGCHANGE, 0, "Environment",
+            SMTO_ABORTIFHUNG, 5000, ctypes.byref(result)
+        )
     
     def _ffmpeg_install_complete(self, success: bool, message: str):
         """Handle FFmpeg installation completion."""
         if success:
             self.status_label.configure(text=f"✅ {message}")
+            # Look FFmpeg up again now that it is installed
+            get_ffmpeg_path.cache_clear()
             self._check_ffmpeg_status()
             messagebox.showinfo("Thành công", message)
         else:
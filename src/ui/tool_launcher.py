@@ -3,8 +3,11 @@ Tool Launcher UI Module
 Main menu window for selecting tools.
 """
 
+import threading
 import customtkinter as ctk
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
+
+from ui.fonts import get_font
 
 
 class ToolCard(ctk.CTkFrame):
@@ -31,44 +34,56 @@ class ToolCard(ctk.CTkFrame):
             fg_color=("#2c3e50", "#1a252f")
         )
         
-        # Make entire card clickable
-        self.bind("<Button-1>", self._handle_click)
-        self.bind("<Enter>", self._on_hover)
-        self.bind("<Leave>", self._on_leave)
+        self._hovered = False
+        # Hover state the card is currently drawn with
+        self._hover_shown = False
+        self._hover_after_id: Optional[str] = None
         
         # Content frame
         self.content = ctk.CTkFrame(self, fg_color="transparent")
         self.content.pack(fill="both", expand=True, padx=20, pady=20)
-        self.content.bind("<Button-1>", self._handle_click)
         
         # Icon
         self.icon_label = ctk.CTkLabel(
             self.content,
             text=icon,
-            font=ctk.CTkFont(size=48)
+            font=get_font(48)
         )
         self.icon_label.pack(pady=(10, 15))
-        self.icon_label.bind("<Button-1>", self._handle_click)
         
         # Title
         self.title_label = ctk.CTkLabel(
             self.content,
             text=title,
-            font=ctk.CTkFont(size=18, weight="bold")
+            font=get_font(18, "bold")
         )
         self.title_label.pack(pady=(0, 8))
-        self.title_label.bind("<Button-1>", self._handle_click)
         
         # Description
         self.desc_label = ctk.CTkLabel(
             self.content,
             text=description,
-            font=ctk.CTkFont(size=12),
+            font=get_font(12),
             text_color="gray",
             wraplength=200
         )
         self.desc_label.pack()
-        self.desc_label.bind("<Button-1>", self._handle_click)
+        
+        # Make entire card clickable and hoverable with single bindings:
+        # every Tk widget inside the card (including CTk's internal
+        # canvases and labels) gets a shared bind tag
+        card_tag = f"ToolCard{id(self)}"
+        self.bind_class(card_tag, "<Button-1>", self._handle_click)
+        self.bind_class(card_tag, "<Enter>", self._on_hover)
+        self.bind_class(card_tag, "<Leave>", self._on_leave)
+        self._add_bind_tag(self, card_tag)
+    
+    @classmethod
+    def _add_bind_tag(cls, widget, tag: str):
+        """Add a bind tag to a widget and all of its descendants."""
+        widget.bindtags((tag,) + widget.bindtags())
+        for child in widget.winfo_children():
+            cls._add_bind_tag(child, tag)
     
     def _handle_click(self, event=None):
         """Handle card click."""
@@ -77,22 +92,69 @@ class ToolCard(ctk.CTkFrame):
     
     def _on_hover(self, event=None):
         """Handle mouse enter."""
-        self.configure(border_color="#e74c3c", fg_color=("#34495e", "#253545"))
+        # Entering another widget of the same card changes nothing
+        if self._hovered:
+            return
+        self._hovered = True
+        self._schedule_hover_redraw()
     
     def _on_leave(self, event=None):
         """Handle mouse leave."""
-        self.configure(border_color="#3498db", fg_color=("#2c3e50", "#1a252f"))
+        if not self._hovered:
+            return
+        # Leaving one of the card's widgets for another one is not leaving the card
+        if event is not None and self._contains_point(event.x_root, event.y_root):
+            return
+        self._hovered = False
+        self._schedule_hover_redraw()
+    
+    def _schedule_hover_redraw(self):
+        """Redraw for the hover state once the pending events are handled."""
+        if self._hover_after_id is None:
+            self._hover_after_id = self.after_idle(self._apply_hover)
+    
+    def _apply_hover(self):
+        """Restyle the card for the latest hover state."""
+        self._hover_after_id = None
+        # Enter/Leave pairs in the same event batch cancel out
+        if self._hovered == self._hover_shown:
+            return
+        self._hover_shown = self._hovered
+        if self._hovered:
+            self.configure(border_color="#e74c3c", fg_color=("#34495e", "#253545"))
+        else:
+            self.configure(border_color="#3498db", fg_color=("#2c3e50", "#1a252f"))
+    
+    def _contains_point(self, x_root: int, y_root: int) -> bool:
+        """Check if a screen position is inside the card."""
+        x = x_root - self.winfo_rootx()
+        y = y_root - self.winfo_rooty()
+        return 0 <= x < self.winfo_width() and 0 <= y < self.winfo_height()
 
 
 class ToolLauncher(ctk.CTk):
     """Main launcher window with tool selection menu."""
     
+    # Initial window size
+    WIDTH = 650
+    HEIGHT = 500
+    
+    # One card per tool: (attribute, icon, title, description, click handler)
+    _TOOL_SPECS = (
+        ("youtube_card", "🎬", "YouTube Downloader",
+         "Tải video từ YouTube, Douyin với nhiều định dạng",
+         "_open_youtube_downloader"),
+        ("capcut_card", "📝", "CapCut Caption",
+         "Trích xuất Caption từ project CapCut ra file SRT/TXT",
+         "_open_capcut_extractor"),
+    )
+    
     def __init__(self):
         super().__init__()
         
-        # Configure window
+        # Configure window, centered on screen at its initial size
         self.title("🧰 Tools Hub")
-        self.geometry("650x500")
+        self._center_window()
         self.minsize(600, 450)
         
         # Set theme
@@ -101,21 +163,27 @@ class ToolLauncher(ctk.CTk):
         
         # Track open tool windows
         self.current_tool_window: Optional[ctk.CTkToplevel] = None
+        # Tool windows by name, hidden rather than destroyed when closed
+        self._tool_windows: Dict[str, ctk.CTkToplevel] = {}
         
         # Build UI
         self._create_widgets()
         
-        # Center window
-        self._center_window()
+        # Import the tool windows while the user picks a tool
+        threading.Thread(target=self._preload_tools, daemon=True).start()
+    
+    @staticmethod
+    def _preload_tools():
+        """Import the tool window modules so opening a tool doesn't wait on imports."""
+        import ui.main_window
+        import ui.capcut_window
     
     def _center_window(self):
         """Center the window on screen."""
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
-        x = (self.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.winfo_screenheight() // 2) - (height // 2)
-        self.geometry(f'{width}x{height}+{x}+{y}')
+        # The size is known up front, so no layout pass is needed to measure it
+        x = (self.winfo_screenwidth() // 2) - (self.WIDTH // 2)
+        y = (self.winfo_screenheight() // 2) - (self.HEIGHT // 2)
+        self.geometry(f'{self.WIDTH}x{self.HEIGHT}+{x}+{y}')
     
     def _create_widgets(self):
         """Create all UI widgets."""
@@ -130,14 +198,14 @@ class ToolLauncher(ctk.CTk):
         self.title_label = ctk.CTkLabel(
             self.header_frame,
             text="🧰 Tools Hub",
-            font=ctk.CTkFont(size=28, weight="bold")
+            font=get_font(28, "bold")
         )
         self.title_label.pack()
         
         self.subtitle_label = ctk.CTkLabel(
             self.header_frame,
             text="Chọn công cụ bạn muốn sử dụng",
-            font=ctk.CTkFont(size=14),
+            font=get_font(14),
             text_color="gray"
         )
         self.subtitle_label.pack(pady=(8, 0))
@@ -146,64 +214,56 @@ class ToolLauncher(ctk.CTk):
         self.tools_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         self.tools_frame.pack(fill="both", expand=True)
         
-        # Configure grid
-        self.tools_frame.grid_columnconfigure(0, weight=1)
-        self.tools_frame.grid_columnconfigure(1, weight=1)
+        # One equally weighted column per tool card
         self.tools_frame.grid_rowconfigure(0, weight=1)
-        
-        # YouTube Downloader Card
-        self.youtube_card = ToolCard(
-            self.tools_frame,
-            icon="🎬",
-            title="YouTube Downloader",
-            description="Tải video từ YouTube, Douyin với nhiều định dạng",
-            on_click=self._open_youtube_downloader
-        )
-        self.youtube_card.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
-        
-        # CapCut Caption Extractor Card
-        self.capcut_card = ToolCard(
-            self.tools_frame,
-            icon="📝",
-            title="CapCut Caption",
-            description="Trích xuất Caption từ project CapCut ra file SRT/TXT",
-            on_click=self._open_capcut_extractor
-        )
-        self.capcut_card.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
+        for column, (attr, icon, title, description, handler) in enumerate(self._TOOL_SPECS):
+            self.tools_frame.grid_columnconfigure(column, weight=1)
+            card = ToolCard(
+                self.tools_frame,
+                icon=icon,
+                title=title,
+                description=description,
+                on_click=getattr(self, handler)
+            )
+            card.grid(row=0, column=column, padx=10, pady=10, sticky="nsew")
+            setattr(self, attr, card)
         
         # Footer
         self.footer_label = ctk.CTkLabel(
             self.main_frame,
             text="💡 Click vào tool để bắt đầu",
-            font=ctk.CTkFont(size=11),
+            font=get_font(11),
             text_color="gray"
         )
         self.footer_label.pack(pady=(20, 0))
     
     def _open_youtube_downloader(self):
         """Open YouTube Downloader tool."""
-        # Close current tool window if open
-        if self.current_tool_window:
-            self.current_tool_window.destroy()
-        
-        # Import and create YouTube Downloader window
+        # Import YouTube Downloader window (usually preloaded)
         from ui.main_window import YouTubeDownloaderWindow
-        self.current_tool_window = YouTubeDownloaderWindow(self, on_back=self._on_tool_close)
-        self.current_tool_window.focus()
-        
-        # Hide launcher
-        self.withdraw()
+        self._show_tool("youtube", YouTubeDownloaderWindow)
     
     def _open_capcut_extractor(self):
         """Open CapCut Caption Extractor tool."""
-        # Close current tool window if open
+        # Import CapCut window (usually preloaded)
+        from ui.capcut_window import CapCutWindow
+        self._show_tool("capcut", CapCutWindow)
+    
+    def _show_tool(self, name: str, window_class: type):
+        """Show a tool window, creating it only the first time."""
+        # Hide current tool window if open
         if self.current_tool_window:
-            self.current_tool_window.destroy()
+            self.current_tool_window.withdraw()
         
-        # Import and create CapCut window
-        from ui.capcut_window import CapCutWindow
-        self.current_tool_window = CapCutWindow(self, on_back=self._on_tool_close)
-        self.current_tool_window.focus()
+        window = self._tool_windows.get(name)
+        if window is None or not window.winfo_exists():
+            window = window_class(self, on_back=self._on_tool_close)
+            self._tool_windows[name] = window
+        else:
+            window.deiconify()
+            window.lift()
+        self.current_tool_window = window
+        window.focus()
         
         # Hide launcher
         self.withdraw()
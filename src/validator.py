@@ -4,28 +4,93 @@ Validates if a given URL is a valid YouTube video URL.
 """
 
 import re
+import string
+from functools import lru_cache
 from typing import Optional, Tuple
 
 
+# One pattern for every supported URL format, so a URL is scanned once.
+# The video ID is group 1.
+#   Standard watch URL: https://www.youtube.com/watch?v=VIDEO_ID
+#   Mobile URL:         https://m.youtube.com/watch?v=VIDEO_ID
+#   Short URL:          https://youtu.be/VIDEO_ID
+#   Shorts URL:         https://www.youtube.com/shorts/VIDEO_ID
+#   Embed URL:          https://www.youtube.com/embed/VIDEO_ID
+_URL_PATTERN = (
+    r'(?:https?://)?(?:www\.|m\.)?'
+    r'(?:youtube\.com/(?:watch\?.*v=|shorts/|embed/)|youtu\.be/)'
+    r'([a-zA-Z0-9_-]{11})'
+)
+# Case-sensitive, for searching lowercased ASCII URLs
+_COMBINED_RE = re.compile(_URL_PATTERN)
+# For the rare non-ASCII input, where lowercasing can shift offsets
+_COMBINED_RE_IGNORECASE = re.compile(_URL_PATTERN, re.IGNORECASE)
+
+# Shortest possible match is "youtu.be/" plus an 11-character ID; anything
+# longer than the upper bound is pasted text rather than a URL
+_MIN_URL_LENGTH = 20
+_MAX_URL_LENGTH = 2048
+
+# URL shapes with the ID at a fixed offset after the host, which can be
+# read with plain string operations instead of the regex
+_FIXED_ID_MARKERS = ('youtu.be/', 'youtube.com/shorts/', 'youtube.com/embed/')
+_ID_LENGTH = 11
+_ID_ALLOWED = frozenset(string.ascii_letters + string.digits + '_-')
+
+
+def _extract_fast(url: str) -> Optional[str]:
+    """Extract the video ID from an already checked and stripped URL."""
+    if not _MIN_URL_LENGTH <= len(url) <= _MAX_URL_LENGTH:
+        return None
+    
+    # Gated first so oversized pastes are never kept as cache keys
+    return _extract_cached(url)
+
+
+@lru_cache(maxsize=1024)
+def _extract_cached(url: str) -> Optional[str]:
+    """
+    Extract the video ID from a stripped URL of plausible length.
+    
+    Cached because the same URL is often pasted or validated repeatedly.
+    """
+    low = url.lower()
+    
+    # Cheap rejection of text that can't contain a YouTube host
+    host = low.find('youtu')
+    if host < 0:
+        return None
+    
+    if url.isascii():
+        # Lowercasing ASCII keeps every offset, so match the lowercased
+        # copy without IGNORECASE and slice the case-sensitive ID from
+        # the original.
+        # Every match contains a host, and the optional scheme/www prefix
+        # can't span one, so a fixed-offset ID after the first host is the
+        # same one the regex would find first
+        for marker in _FIXED_ID_MARKERS:
+            if low.startswith(marker, host):
+                start = host + len(marker)
+                candidate = url[start:start + _ID_LENGTH]
+                if len(candidate) == _ID_LENGTH and _ID_ALLOWED.issuperset(candidate):
+                    return candidate
+                break
+        
+        match = _COMBINED_RE.search(low)
+        return url[match.start(1):match.end(1)] if match else None
+    
+    match = _COMBINED_RE_IGNORECASE.search(url)
+    return match.group(1) if match else None
+
+
 class YouTubeValidator:
     """Validates YouTube URLs and extracts video IDs."""
     
-    # Regex patterns for different YouTube URL formats
-    PATTERNS = [
-        # Standard watch URL: https://www.youtube.com/watch?v=VIDEO_ID
-        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?.*v=([a-zA-Z0-9_-]{11})',
-        # Short URL: https://youtu.be/VIDEO_ID
-        r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]{11})',
-        # Shorts URL: https://www.youtube.com/shorts/VIDEO_ID
-        r'(?:https?://)?(?:www\.)?youtube\.com/shorts/([a-zA-Z0-9_-]{11})',
-        # Embed URL: https://www.youtube.com/embed/VIDEO_ID
-        r'(?:https?://)?(?:www\.)?youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-        # Mobile URL: https://m.youtube.com/watch?v=VIDEO_ID
-        r'(?:https?://)?m\.youtube\.com/watch\?.*v=([a-zA-Z0-9_-]{11})',
-    ]
+    # Stateless; the methods are static so calls skip binding a class
+    __slots__ = ()
     
-    @classmethod
-    def is_youtube_url(cls, url: str) -> bool:
+    @staticmethod
+    def is_youtube_url(url: str) -> bool:
         """
         Check if the given URL is a valid YouTube URL.
         
@@ -38,16 +103,10 @@ class YouTubeValidator:
         if not url or not isinstance(url, str):
             return False
         
-        url = url.strip()
-        
-        for pattern in cls.PATTERNS:
-            if re.search(pattern, url, re.IGNORECASE):
-                return True
-        
-        return False
+        return _extract_fast(url.strip()) is not None
     
-    @classmethod
-    def extract_video_id(cls, url: str) -> Optional[str]:
+    @staticmethod
+    def extract_video_id(url: str) -> Optional[str]:
         """
         Extract the video ID from a YouTube URL.
         
@@ -60,17 +119,10 @@ class YouTubeValidator:
         if not url or not isinstance(url, str):
             return None
         
-        url = url.strip()
-        
-        for pattern in cls.PATTERNS:
-            match = re.search(pattern, url, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        
-        return None
+        return _extract_fast(url.strip())
     
-    @classmethod
-    def validate_and_extract(cls, url: str) -> Tuple[bool, Optional[str], str]:
+    @staticmethod
+    def validate_and_extract(url: str) -> Tuple[bool, Optional[str], str]:
         """
         Validate URL and extract video ID in one call.
         
@@ -88,7 +140,7 @@ class YouTubeValidator:
         if not url:
             return False, None, "URL không được để trống"
         
-        video_id = cls.extract_video_id(url)
+        video_id = _extract_fast(url)
         
         if video_id:
             return True, video_id, "URL YouTube hợp lệ"
@@ -99,9 +151,13 @@ class YouTubeValidator:
 # Convenience functions
 def is_youtube_url(url: str) -> bool:
     """Check if URL is a valid YouTube URL."""
-    return YouTubeValidator.is_youtube_url(url)
+    if not url or not isinstance(url, str):
+        return False
+    return _extract_fast(url.strip()) is not None
 
 
 def extract_video_id(url: str) -> Optional[str]:
     """Extract video ID from YouTube URL."""
-    return YouTubeValidator.extract_video_id(url)
+    if not url or not isinstance(url, str):
+        return None
+    return _extract_fast(url.strip())
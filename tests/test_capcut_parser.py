@@ -0,0 +1,48 @@
+"""
+Tests for CapCut caption formatting.
+"""
+
+import os
+import sys
+import unittest
+
+# Add src to path for imports, as main.py does when run directly
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from capcut_parser import CapCutParser, CaptionItem
+
+
+class TestSrtTime(unittest.TestCase):
+    """SRT timestamps keep every millisecond."""
+
+    def test_float_error_is_not_truncated(self):
+        self.assertEqual(CapCutParser._format_srt_time(1.001), "00:00:01,001")
+        self.assertEqual(CapCutParser._format_srt_time(4.035), "00:00:04,035")
+
+    def test_microsecond_draft_times(self):
+        # parse_draft converts CapCut's microseconds to float seconds
+        self.assertEqual(CapCutParser._format_srt_time(1_001_000 / 1000000.0), "00:00:01,001")
+        self.assertEqual(CapCutParser._format_srt_time(4_035_000 / 1000000.0), "00:00:04,035")
+
+    def test_millisecond_sweep(self):
+        for ms in range(0, 100_000):
+            expected = "%02d:%02d:%02d,%03d" % (
+                ms // 3_600_000, ms // 60_000 % 60, ms // 1000 % 60, ms % 1000)
+            self.assertEqual(CapCutParser._format_srt_time(ms / 1000), expected)
+
+    def test_hours(self):
+        self.assertEqual(CapCutParser._format_srt_time(3723.456), "01:02:03,456")
+
+    def test_to_srt(self):
+        captions = [CaptionItem("Xin chào", 1.001, 4.035), CaptionItem("Hello", 4.5, 8.0)]
+        self.assertEqual(
+            CapCutParser.to_srt(captions),
+            "1\r\n00:00:01,001 --> 00:00:04,035\r\nXin chào\r\n"
+            "\r\n2\r\n00:00:04,500 --> 00:00:08,000\r\nHello\r\n"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for the YouTube URL validator.
+"""
+
+import os
+import sys
+import unittest
+
+# Add src to path for imports, as main.py does when run directly
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from validator import YouTubeValidator, extract_video_id, is_youtube_url
+
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+
+
+class TestUrlShapes(unittest.TestCase):
+    """Every supported URL shape yields its video ID."""
+
+    def assertExtracts(self, url: str, video_id: str = VIDEO_ID):
+        self.assertEqual(YouTubeValidator.extract_video_id(url), video_id)
+        self.assertEqual(extract_video_id(url), video_id)
+        self.assertTrue(YouTubeValidator.is_youtube_url(url))
+        self.assertTrue(is_youtube_url(url))
+        self.assertEqual(YouTubeValidator.validate_and_extract(url),
+                         (True, video_id, "URL YouTube hợp lệ"))
+
+    def test_watch(self):
+        self.assertExtracts(f'https://www.youtube.com/watch?v={VIDEO_ID}')
+        self.assertExtracts(f'youtube.com/watch?v={VIDEO_ID}')
+        self.assertExtracts(f'https://www.youtube.com/watch?feature=share&v={VIDEO_ID}')
+
+    def test_mobile_watch(self):
+        self.assertExtracts(f'https://m.youtube.com/watch?v={VIDEO_ID}')
+
+    def test_short_url(self):
+        self.assertExtracts(f'https://youtu.be/{VIDEO_ID}')
+        self.assertExtracts(f'youtu.be/{VIDEO_ID}')
+
+    def test_shorts(self):
+        self.assertExtracts(f'https://www.youtube.com/shorts/{VIDEO_ID}')
+
+    def test_embed(self):
+        self.assertExtracts(f'https://www.youtube.com/embed/{VIDEO_ID}')
+
+    def test_mixed_case_host(self):
+        self.assertExtracts(f'HTTPS://WWW.YouTube.COM/watch?v={VIDEO_ID}')
+        self.assertExtracts(f'https://YOUTU.BE/{VIDEO_ID}')
+        self.assertExtracts(f'https://www.youtube.com/SHORTS/{VIDEO_ID}')
+
+    def test_id_case_is_kept(self):
+        self.assertExtracts('https://youtu.be/ABCdefGHIjk', 'ABCdefGHIjk')
+
+    def test_trailing_query_or_fragment(self):
+        self.assertExtracts(f'https://www.youtube.com/watch?v={VIDEO_ID}&t=42s')
+        self.assertExtracts(f'https://youtu.be/{VIDEO_ID}?si=abc123')
+        self.assertExtracts(f'https://www.youtube.com/shorts/{VIDEO_ID}#comments')
+
+    def test_id_with_dash_and_underscore(self):
+        self.assertExtracts('https://youtu.be/a-b_c-d_e-f', 'a-b_c-d_e-f')
+        self.assertExtracts('https://www.youtube.com/embed/_-_-_-_-_-_', '_-_-_-_-_-_')
+        self.assertExtracts('https://www.youtube.com/watch?v=-_abcdefghi', '-_abcdefghi')
+
+    def test_surrounding_whitespace(self):
+        self.assertExtracts(f'  https://youtu.be/{VIDEO_ID}\n')
+
+    def test_non_ascii_input(self):
+        # Non-ASCII text takes the IGNORECASE fallback instead of lowercasing
+        self.assertExtracts(f'https://www.YouTube.com/watch?v={VIDEO_ID}&title=İstanbul')
+        self.assertExtracts(f'Xem video: https://YOUTU.BE/{VIDEO_ID} đẹp quá')
+
+
+class TestRejected(unittest.TestCase):
+    """Inputs that are not supported YouTube video URLs."""
+
+    def assertRejected(self, url):
+        self.assertIsNone(YouTubeValidator.extract_video_id(url))
+        self.assertIsNone(extract_video_id(url))
+        self.assertFalse(YouTubeValidator.is_youtube_url(url))
+        self.assertFalse(is_youtube_url(url))
+
+    def test_non_youtube_url(self):
+        self.assertRejected(f'https://vimeo.com/{VIDEO_ID}')
+        self.assertRejected(f'https://example.com/watch?v={VIDEO_ID}')
+        self.assertRejected(f'https://www.youtube.co/watch?v={VIDEO_ID}')
+
+    def test_v_path_is_not_supported(self):
+        # The legacy /v/ form has never been one of the supported shapes
+        self.assertRejected(f'https://www.youtube.com/v/{VIDEO_ID}')
+
+    def test_short_id(self):
+        self.assertRejected('https://youtu.be/abc')
+        self.assertRejected('https://www.youtube.com/watch?v=abc')
+
+    def test_invalid_id_characters(self):
+        self.assertRejected('https://youtu.be/dQw4w9WgX!Q')
+
+    def test_below_minimum_length(self):
+        url = 'youtu.be/dQw4w9WgXc'
+        self.assertEqual(len(url), 19)
+        self.assertRejected(url)
+
+    def test_minimum_length(self):
+        url = f'youtu.be/{VIDEO_ID}'
+        self.assertEqual(len(url), 20)
+        self.assertEqual(extract_video_id(url), VIDEO_ID)
+
+    def test_over_maximum_length(self):
+        url = f'https://www.youtube.com/watch?v={VIDEO_ID}&list=' + 'x' * 2048
+        self.assertGreater(len(url), 2048)
+        self.assertRejected(url)
+
+    def test_empty_and_non_string(self):
+        for value in ('', '   ', None, 123):
+            self.assertRejected(value)
+        self.assertEqual(YouTubeValidator.validate_and_extract('   '),
+                         (False, None, "URL không được để trống"))
+        self.assertEqual(YouTubeValidator.validate_and_extract('https://example.com/abc'),
+                         (False, None, "Đây không phải URL YouTube hợp lệ"))
+
+
+class TestMultipleUrls(unittest.TestCase):
+    """Text with several URLs yields the first recognised video."""
+
+    def test_first_url_wins(self):
+        text = 'https://youtu.be/AAAAAAAAAAA https://youtu.be/BBBBBBBBBBB'
+        self.assertEqual(extract_video_id(text), 'AAAAAAAAAAA')
+
+    def test_invalid_fast_path_falls_back_to_regex(self):
+        # The first host has a bad ID, so the regex finds the later watch URL
+        text = 'youtu.be/abc youtube.com/watch?v=BBBBBBBBBBB'
+        self.assertEqual(extract_video_id(text), 'BBBBBBBBBBB')
+
+
+if __name__ == '__main__':
+    unittest.main()